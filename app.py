@@ -0,0 +1,128 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Union
+
+import numpy as np
+import pandas as pd
+from fastapi import Body, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from uvicorn import run as app_run
+
+from src.constants import (APP_HOST, APP_PORT, APP_WORKERS_ENV_KEY, BATCH_PREDICTION_CHUNK_ROWS,
+                           SERVING_MODEL_FILE_PATH, SHARED_MODEL_DIR, SHARED_MODEL_DIR_ENV_KEY)
+from src.entity.shared_estimator import export_shared_model
+from src.pipeline.prediction_pipeline import VehicleDataClassifier
+from src.utils.batch_io import (ARROW_STREAM_CONTENT_TYPE, UnsupportedBatchFormat, batch_format, read_batch,
+                                validate_batch_columns, write_arrow_chunks, write_ndjson_chunks)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if model_predictor.prediction_pipeline_config.shared_model_dir:
+        # Multi-worker mode: attach at worker startup so the shared memory report is logged before serving
+        model_predictor.load_model()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Allow all origins for Cross-Origin Resource Sharing (CORS)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+model_predictor = VehicleDataClassifier()
+
+
+@app.get("/predict/{customer_id}")
+def predict_by_id(customer_id: int):
+    """
+    Scores an existing customer using features fetched from the online feature store.
+    """
+    try:
+        prediction = model_predictor.predict_by_id(customer_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if prediction is None:
+        raise HTTPException(status_code=404, detail=f"Customer id {customer_id} not found in online feature store")
+    return {"id": customer_id, "prediction": prediction}
+
+
+@app.post("/predict")
+def predict(payload: Union[dict, list] = Body(...)):
+    """
+    Scores one vehicle insurance record (a JSON object) or a batch of records (a JSON array of objects).
+    Records are checked against the schema like `/predict/batch`; invalid input is answered with 422.
+    """
+    records = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(record, dict) for record in records):
+        raise HTTPException(status_code=422, detail=["Each record must be a JSON object"])
+    dataframe = pd.DataFrame.from_records(records)
+    errors = validate_batch_columns(dataframe)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    predictions = model_predictor.predict(dataframe)
+    return {"predictions": [int(prediction) for prediction in predictions]}
+
+
+@app.post("/predict/batch")
+async def predict_batch(request: Request):
+    """
+    Scores a columnar batch sent as NDJSON (`application/x-ndjson`) or Arrow IPC
+    (`application/vnd.apache.arrow.stream` or `.file`), streaming the predictions back as NDJSON or an
+    Arrow IPC stream respectively.
+    Each output record holds the `id` of the input record, when given, and its `prediction`.
+    """
+    content_type = request.headers.get("content-type")
+    try:
+        output_format = batch_format(content_type)
+    except UnsupportedBatchFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    body = await request.body()
+    try:
+        dataframe = await run_in_threadpool(read_batch, body, content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse {output_format} body: {e}")
+    errors = validate_batch_columns(dataframe)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    def prediction_chunks():
+        for start in range(0, len(dataframe), BATCH_PREDICTION_CHUNK_ROWS):
+            chunk = dataframe.iloc[start:start + BATCH_PREDICTION_CHUNK_ROWS]
+            predictions = pd.DataFrame({"prediction": np.asarray(model_predictor.predict(chunk), dtype=np.int64)})
+            if "id" in chunk.columns:
+                predictions.insert(0, "id", chunk["id"].to_numpy())
+            yield predictions
+
+    if output_format == "arrow":
+        return StreamingResponse(write_arrow_chunks(prediction_chunks()), media_type=ARROW_STREAM_CONTENT_TYPE)
+    return StreamingResponse(write_ndjson_chunks(prediction_chunks()), media_type="application/x-ndjson")
+
+
+@app.get("/shadow/stats")
+def shadow_stats():
+    """
+    Reports agreement and latency of the shadow challenger model, if one is deployed.
+    """
+    model_predictor.load_model()
+    if model_predictor.shadow_scorer is None:
+        return {"enabled": False}
+    return {"enabled": True, **model_predictor.shadow_scorer.stats()}
+
+
+if __name__ == "__main__":
+    workers = int(os.getenv(APP_WORKERS_ENV_KEY, "1"))
+    if workers > 1:
+        # Export the model once; workers inherit the bundle location and map its arrays read-only
+        export_shared_model(SERVING_MODEL_FILE_PATH, SHARED_MODEL_DIR)
+        os.environ[SHARED_MODEL_DIR_ENV_KEY] = SHARED_MODEL_DIR
+        app_run("app:app", host=APP_HOST, port=APP_PORT, workers=workers)
+    else:
+        app_run(app, host=APP_HOST, port=APP_PORT)
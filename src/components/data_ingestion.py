@@ -1,14 +1,32 @@
 import os
 import sys
 
-from pandas import DataFrame
-from sklearn.model_selection import train_test_split
+import numpy as np
+import pandas as pd
 
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
 from src.entity.config_entity import DataIngestionConfig
 from src.entity.artifact_entity import DataIngestionArtifact
 from src.exception import MyException
 from src.logger import logging
 from src.data_access.vehicle_insuarance_data import VehicleInsuranceData
+from src.data_access.online_feature_store import OnlineFeatureStore
+from src.utils.main_utils import atomic_write, read_yaml_file, save_numpy_array_data
+from src.utils.deduplication import StreamDeduplicator
+
+
+def _stable_unit_hash(ids: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Maps int64 ids to floats in [0, 1) with a seeded SplitMix64 finaliser; the value of an id depends only
+    on the id and the seed, never on the other rows.
+    """
+    with np.errstate(over="ignore"):
+        z = ids.astype(np.int64).view(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
 
 class DataIngestion:
     def __init__(self, data_ingestion_config: DataIngestionConfig = DataIngestionConfig()):
@@ -27,17 +45,22 @@ class DataIngestion:
         try:
             logging.info(f"{'>>'*20} Data Ingestion {'<<'*20}")
             self.data_ingestion_config = data_ingestion_config
+            self.duplicate_count = 0
         except Exception as e:
             raise MyException(e, sys) from e
 
-    def export_data_into_feature_store(self) -> DataFrame:
+    def export_data_into_feature_store(self) -> str:
         """
         Exports data from MongoDB collection into a feature store as a CSV file.
+        Documents are streamed in batches and each batch is appended to the CSV as it arrives, so only one
+        batch is held in memory. If enabled, rows whose key (`id` or row content hash) was already seen are
+        dropped in the same pass; the number of dropped rows is kept in `duplicate_count`. Documents stream
+        in `_id` order, so feature store row positions do not depend on the order MongoDB stores them in.
         
         Returns:
         -------
-        DataFrame
-            The exported data as a pandas DataFrame.
+        str
+            Path of the feature store CSV.
         
         Raises:
         ------
@@ -47,30 +70,55 @@ class DataIngestion:
         try:
             logging.info("Exporting data from MongoDB to feature store")
             vehicle_insurance_data = VehicleInsuranceData()
-            df: DataFrame = vehicle_insurance_data.get_vehicle_insurance_data_as_dataframe(collection_name=
-                                                                   self.data_ingestion_config.collection_name)
+            deduplicator = None
+            if self.data_ingestion_config.deduplicate:
+                column_types = dict(next(iter(column_spec.items()))
+                                    for column_spec in read_yaml_file(SCHEMA_FILE_PATH)["columns"])
+                deduplicator = StreamDeduplicator(key=self.data_ingestion_config.dedup_key,
+                                                  column_types=column_types)
+
             feature_store_file_path = self.data_ingestion_config.feature_store_file_path
             
             # Create feature store directory if it doesn't exist
             feature_store_dir = os.path.dirname(feature_store_file_path)
             os.makedirs(feature_store_dir, exist_ok=True)
             
-            # Save the DataFrame to CSV
-            df.to_csv(feature_store_file_path, index=False)
-            logging.info(f"Data exported to feature store at: {feature_store_file_path}")
-            return df
+            # Append each batch to the CSV; the columns of the first batch form the header
+            columns = None
+            row_count = 0
+            with atomic_write(feature_store_file_path, "w") as file_obj:
+                for batch in vehicle_insurance_data.iter_vehicle_insurance_data(
+                        collection_name=self.data_ingestion_config.collection_name,
+                        batch_size=self.data_ingestion_config.batch_size):
+                    if deduplicator is not None:
+                        batch = deduplicator.deduplicate(batch)
+                    is_first_batch = columns is None
+                    if is_first_batch:
+                        columns = batch.columns
+                    batch.reindex(columns=columns).to_csv(file_obj, index=False, header=is_first_batch)
+                    row_count += len(batch)
+
+            if deduplicator is not None:
+                self.duplicate_count = deduplicator.duplicate_count
+                logging.info(f"Dropped {self.duplicate_count} duplicate rows out of {deduplicator.row_count} "
+                             f"on key '{self.data_ingestion_config.dedup_key}'")
+            logging.info(f"{row_count} rows exported to feature store at: {feature_store_file_path}")
+            return feature_store_file_path
         except Exception as e:
             raise MyException(e, sys) from e
         
     
-    def split_data_as_train_test(self, df: DataFrame) -> None:
+    def split_data_as_train_test(self) -> None:
         """
-        Splits the DataFrame into training and testing sets and saves them as CSV files.
-        
-        Parameters:
-        ----------
-        df : DataFrame
-            The input DataFrame to be split.
+        Splits the feature store rows into training and testing sets and saves the split as an index manifest:
+        two sorted int32 arrays of feature store row positions. Downstream stages read their subset through
+        these indices, so the data is not copied per split.
+
+        Split membership is a seeded hash of each row's `id`, not a shuffle of row positions, so a customer
+        stays on the same side of the split as the collection grows and models trained on earlier runs are
+        never scored on their own training rows. The hash is independent of the target, so each class is
+        split in the configured ratio up to sampling noise; the per-split positive rates are logged.
+        Only the `id` and target columns of the feature store are read.
         
         Raises:
         ------
@@ -79,38 +127,61 @@ class DataIngestion:
         """
         try:
             logging.info("Splitting data into train and test sets")
-            train_set, test_set = train_test_split(
-                df,
-                test_size=self.data_ingestion_config.train_test_split_ratio
-            )
-            logging.info("Data split into train and test sets successfully")
+            df = pd.read_csv(self.data_ingestion_config.feature_store_file_path, usecols=["id", TARGET_COLUMN])
+            ids = pd.to_numeric(df["id"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+            is_test = _stable_unit_hash(ids, seed=self.data_ingestion_config.random_state) < \
+                self.data_ingestion_config.train_test_split_ratio
+            train_index = np.flatnonzero(~is_test).astype(np.int32)
+            test_index = np.flatnonzero(is_test).astype(np.int32)
+            target = df[TARGET_COLUMN].to_numpy()
+            logging.info(f"Data split into train and test sets successfully; positive rate "
+                         f"{target[train_index].mean():.4f} in train, {target[test_index].mean():.4f} in test")
 
-            logging.info("Saving train and test sets to feature store")
-            # Save the train and test sets to CSV files
-            train_file_path = self.data_ingestion_config.training_file_path
-            test_file_path = self.data_ingestion_config.testing_file_path
+            train_index_file_path = self.data_ingestion_config.train_index_file_path
+            test_index_file_path = self.data_ingestion_config.test_index_file_path
             
-            logging.info(f"Saving train data at: {train_file_path}")
-            os.makedirs(os.path.dirname(train_file_path), exist_ok=True)
-            logging.info(f"Saving test data at: {test_file_path}")
-            os.makedirs(os.path.dirname(test_file_path), exist_ok=True)
+            logging.info(f"Saving train index at: {train_index_file_path}")
+            save_numpy_array_data(train_index_file_path, train_index)
+            logging.info(f"Saving test index at: {test_index_file_path}")
+            save_numpy_array_data(test_index_file_path, test_index)
             
-            logging.info("Saving train and test data to CSV files")
-            train_set.to_csv(train_file_path, index=False, header=True)
-            test_set.to_csv(test_file_path, index=False, header=True)
-            
-            logging.info(f"Train and test data saved at: {train_file_path} and {test_file_path}")
+            logging.info(f"Train and test indices saved: {len(train_index)} train rows, {len(test_index)} test rows")
         except Exception as e:
             raise MyException(e, sys) from e
         
+    def build_online_feature_store(self) -> str:
+        """
+        Builds the read-only online feature store used by the prediction service for lookups by customer id
+        from the feature store CSV. The new version is published atomically, replacing the one built by the
+        previous run.
+        
+        Returns:
+        -------
+        str
+            Root directory of the online feature store.
+        
+        Raises:
+        ------
+        MyException
+            If there is an issue while building the store.
+        """
+        try:
+            online_store_dir = self.data_ingestion_config.online_store_dir
+            logging.info(f"Building online feature store at: {online_store_dir}")
+            OnlineFeatureStore.build(feature_store_file_path=self.data_ingestion_config.feature_store_file_path,
+                                     store_dir=online_store_dir)
+            return online_store_dir
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def initiate_data_ingestion(self) -> DataIngestionArtifact:
         """
-        Initiates the data ingestion process: exports data, splits it, and saves the train/test sets.
+        Initiates the data ingestion process: exports data, splits it, and saves the train/test index manifest.
         
         Returns:
         -------
         DataIngestionArtifact
-            Artifact containing paths to the train and test data files.
+            Artifact containing the feature store path and the train and test index files.
         
         Raises:
         ------
@@ -119,17 +190,23 @@ class DataIngestion:
         """
         try:
             logging.info("Starting data ingestion process")
-            df = self.export_data_into_feature_store()
+            self.export_data_into_feature_store()
             logging.info("Exported data from MongoDB to feature store successfully")
 
             logging.info("Splitting data into train and test sets")
-            self.split_data_as_train_test(df=df)
+            self.split_data_as_train_test()
             logging.info("Data split into train and test sets successfully")
-            
+
+            online_store_dir = None
+            if self.data_ingestion_config.build_online_store:
+                online_store_dir = self.build_online_feature_store()
             
             data_ingestion_artifact = DataIngestionArtifact(
-                training_file_path=self.data_ingestion_config.training_file_path,
-                testing_file_path=self.data_ingestion_config.testing_file_path
+                feature_store_file_path=self.data_ingestion_config.feature_store_file_path,
+                train_index_file_path=self.data_ingestion_config.train_index_file_path,
+                test_index_file_path=self.data_ingestion_config.test_index_file_path,
+                online_store_dir=online_store_dir,
+                duplicate_count=self.duplicate_count
             )
             logging.info(f"Data ingestion completed successfully: {data_ingestion_artifact}")
             return data_ingestion_artifact
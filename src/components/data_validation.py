@@ -1,13 +1,14 @@
 import json
 import os
 import sys
+from typing import Optional
 
 import pandas as pd
 from pandas import DataFrame
 
 from src.exception import MyException
 from src.logger import logging
-from src.utils.main_utils import read_yaml_file, write_yaml_file
+from src.utils.main_utils import load_numpy_array_data, read_yaml_file, write_yaml_file
 from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from src.entity.config_entity import DataValidationConfig
 from src.constants import SCHEMA_FILE_PATH
@@ -74,16 +75,17 @@ class DataValidation:
             raise MyException(e, sys) from e
     
     @staticmethod
-    def read_data(file_path: str) -> DataFrame:
+    def read_data(file_path: str, nrows: Optional[int] = None) -> DataFrame:
         """
         Reads a CSV file and returns a pandas DataFrame.
         Args:
             file_path (str): The path to the CSV file.
+            nrows (Optional[int]): Read only the first `nrows` rows; 0 reads just the header.
         Returns:
             DataFrame: The loaded pandas DataFrame.
         """
         try:
-            dataframe = pd.read_csv(file_path)
+            dataframe = pd.read_csv(file_path, nrows=nrows)
             logging.info(f"Data read successfully from {file_path}")
             return dataframe
         except Exception as e:
@@ -97,31 +99,32 @@ class DataValidation:
         """
         try:
             logging.info("Starting data validation process")
-            train_dataframe = self.read_data(self.data_ingestion_artifact.training_file_path)
-            test_dataframe = self.read_data(self.data_ingestion_artifact.testing_file_path)
+            # The train and test splits are row subsets of the feature store, so they share its columns:
+            # validate its header once instead of loading the data and copying out each split
+            dataframe = self.read_data(self.data_ingestion_artifact.feature_store_file_path, nrows=0)
+            train_index = load_numpy_array_data(self.data_ingestion_artifact.train_index_file_path)
+            test_index = load_numpy_array_data(self.data_ingestion_artifact.test_index_file_path)
             
             validation_status = True
             message = ""
-            # Validate training data
-            if not self.validate_number_of_columns(train_dataframe):
+            if not self.validate_number_of_columns(dataframe):
                 validation_status = False
-                message += f"Training data does not have the expected number of columns"
+                message += f"Feature store data does not have the expected number of columns"
                 logging.error(message)
             
-            if not self.is_columns_exist(train_dataframe):
+            if not self.is_columns_exist(dataframe):
                 validation_status = False
-                message += f"Training data is missing required columns"
+                message += f"Feature store data is missing required columns"
                 logging.error(message)
             
-            # Validate testing data
-            if not self.validate_number_of_columns(test_dataframe):
+            if len(train_index) == 0:
                 validation_status = False
-                message += f"Testing data does not have the expected number of columns"
+                message += f"Training data is empty"
                 logging.error(message)
             
-            if not self.is_columns_exist(test_dataframe):
+            if len(test_index) == 0:
                 validation_status = False
-                message += f"Testing data is missing required columns"
+                message += f"Testing data is empty"
                 logging.error(message)
 
             message += f"Data Validation Successful" if validation_status else f"Data Validation Failed"
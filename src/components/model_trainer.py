@@ -0,0 +1,370 @@
+import os
+import sys
+import time
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.constants import TARGET_COLUMN
+from src.entity.artifact_entity import DataIngestionArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
+from src.entity.config_entity import ModelTrainerConfig
+from src.entity.estimator import MyModel, VehiclePreprocessor
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import load_object, save_object, write_yaml_file, read_split_data, iter_split_chunks
+from src.utils.array_store import ShardedArray, ShardedArrayWriter
+
+
+class ModelTrainer:
+    def __init__(self, data_ingestion_artifact: DataIngestionArtifact,
+                 model_trainer_config: ModelTrainerConfig):
+        """
+        Initializes the ModelTrainer component.
+
+        Parameters:
+        ----------
+        data_ingestion_artifact : DataIngestionArtifact
+            Artifact from the data ingestion step, pointing at the feature store and the train/test indices.
+        model_trainer_config : ModelTrainerConfig
+            Configuration for model training.
+        """
+        try:
+            logging.info(f"{'>>'*20} Model Trainer {'<<'*20}")
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.model_trainer_config = model_trainer_config
+            self.warm_started = False
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def iter_chunks(self, index_file_path: str) -> Iterator[DataFrame]:
+        """
+        Streams the feature store rows of a split in chunks of at most `chunk_size` rows.
+        """
+        return iter_split_chunks(self.data_ingestion_artifact.feature_store_file_path, index_file_path,
+                                 self.model_trainer_config.chunk_size)
+
+    def read_split(self, index_file_path: str) -> DataFrame:
+        """
+        Reads all feature store rows of a split into memory.
+        """
+        return read_split_data(self.data_ingestion_artifact.feature_store_file_path, index_file_path)
+
+    def transform_split(self, preprocessor: VehiclePreprocessor, index_file_path: str, split_name: str,
+                        shard_rows: int = None) -> Tuple[ShardedArray, ShardedArray]:
+        """
+        Streams a split through the fitted preprocessor into sharded, memory-mapped feature and target stores
+        under `transformed_data_dir/<split_name>`. With `downcast`, features are stored as float32 (the dtype
+        the forest trains on) and targets as int8.
+
+        Returns:
+        -------
+        Tuple[ShardedArray, ShardedArray]
+            Readers over the transformed features and the targets.
+        """
+        try:
+            store_dir = os.path.join(self.model_trainer_config.transformed_data_dir, split_name)
+            shard_rows = shard_rows or self.model_trainer_config.shard_rows
+            downcast = self.model_trainer_config.downcast
+            feature_writer = ShardedArrayWriter(os.path.join(store_dir, "features"), shard_rows,
+                                                dtype="float32" if downcast else None)
+            target_writer = ShardedArrayWriter(os.path.join(store_dir, "target"), shard_rows,
+                                               dtype="int8" if downcast else None)
+            for chunk in self.iter_chunks(index_file_path):
+                feature_writer.append(preprocessor.transform(chunk))
+                target_writer.append(chunk[TARGET_COLUMN].to_numpy())
+            return feature_writer.close(), target_writer.close()
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def train_in_memory(self, store_name: str = "train") -> Tuple[VehiclePreprocessor, RandomForestClassifier]:
+        """
+        Fits the preprocessor and a RandomForestClassifier on the full training split. The transformed
+        training matrix is written to the array store under `store_name`; the forest is fitted on its
+        memory-mapped view when the split fits in one shard, otherwise on the shards concatenated in memory.
+
+        Returns:
+        -------
+        Tuple[VehiclePreprocessor, RandomForestClassifier]
+            The fitted preprocessor and model.
+        """
+        try:
+            logging.info("Training RandomForestClassifier in memory")
+            train_index_file_path = self.data_ingestion_artifact.train_index_file_path
+            preprocessor = VehiclePreprocessor()
+            for chunk in self.iter_chunks(train_index_file_path):
+                preprocessor.partial_fit(chunk)
+            x_train_store, y_train_store = self.transform_split(preprocessor, train_index_file_path, store_name)
+            x_train = x_train_store.to_array()
+            y_train = y_train_store.to_array()
+
+            model = RandomForestClassifier(
+                n_estimators=self.model_trainer_config.n_estimators,
+                min_samples_split=self.model_trainer_config.min_samples_split,
+                min_samples_leaf=self.model_trainer_config.min_samples_leaf,
+                max_depth=self.model_trainer_config.max_depth,
+                criterion=self.model_trainer_config.criterion,
+                random_state=self.model_trainer_config.random_state,
+                n_jobs=-1
+            )
+            model.fit(x_train, y_train)
+            logging.info("Model training done.")
+            return preprocessor, model
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def train_out_of_core(self) -> Tuple[VehiclePreprocessor, Pipeline]:
+        """
+        Trains a logistic-loss SGDClassifier by streaming the training split in chunks, so peak memory is
+        bounded by `chunk_size` rather than the dataset size.
+
+        A streaming pre-pass fits the preprocessor's scalers; the split is then transformed once into the
+        array store (shards of at most `chunk_size` rows). A pass over the shards fits a StandardScaler on the
+        transformed features (SGD is sensitive to feature scale) and counts the classes for balanced class
+        weights, and each epoch calls `partial_fit` shard by shard.
+
+        Returns:
+        -------
+        Tuple[VehiclePreprocessor, Pipeline]
+            The fitted preprocessor and the feature scaler + SGDClassifier pipeline.
+        """
+        try:
+            train_index_file_path = self.data_ingestion_artifact.train_index_file_path
+            logging.info(f"Training SGDClassifier out of core from: {self.data_ingestion_artifact.feature_store_file_path}")
+
+            preprocessor = VehiclePreprocessor()
+            for chunk in self.iter_chunks(train_index_file_path):
+                preprocessor.partial_fit(chunk)
+            x_train_store, y_train_store = self.transform_split(
+                preprocessor, train_index_file_path, "train",
+                shard_rows=min(self.model_trainer_config.shard_rows, self.model_trainer_config.chunk_size)
+            )
+
+            feature_scaler = StandardScaler()
+            class_counts = np.zeros(2, dtype=np.int64)
+            for shard_index in range(x_train_store.num_shards):
+                feature_scaler.partial_fit(x_train_store.shard(shard_index))
+                class_counts += np.bincount(y_train_store.shard(shard_index), minlength=2)[:2]
+            logging.info(f"Streaming pre-passes done, class counts: {class_counts.tolist()}")
+
+            n_samples = class_counts.sum()
+            class_weight = {label: n_samples / (2 * max(count, 1)) for label, count in enumerate(class_counts)}
+            model = SGDClassifier(
+                loss="log_loss",
+                class_weight=class_weight,
+                random_state=self.model_trainer_config.random_state
+            )
+            classes = np.array([0, 1])
+            rng = np.random.default_rng(self.model_trainer_config.random_state)
+
+            for epoch in range(self.model_trainer_config.out_of_core_epochs):
+                for shard_index in rng.permutation(x_train_store.num_shards):
+                    y_shard = y_train_store.shard(shard_index)
+                    order = rng.permutation(len(y_shard))
+                    x_shard = feature_scaler.transform(x_train_store.shard(shard_index)[order])
+                    model.partial_fit(x_shard, y_shard[order], classes=classes)
+                logging.info(f"Out-of-core epoch {epoch + 1}/{self.model_trainer_config.out_of_core_epochs} done")
+            return preprocessor, Pipeline([("scaler", feature_scaler), ("classifier", model)])
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def select_incremental_sample(self, train_df: DataFrame) -> DataFrame:
+        """
+        Selects the rows the additional trees are fitted on: the most recent `incremental_recent_fraction`
+        of the training split (ids grow as documents are inserted) plus a random re-sample of
+        `incremental_resample_fraction` of the older rows, so new trees do not forget the older population.
+        """
+        df = train_df.sort_values("id", kind="mergesort")
+        n_recent = int(np.ceil(len(df) * self.model_trainer_config.incremental_recent_fraction))
+        recent_df = df.iloc[len(df) - n_recent:]
+        older_df = df.iloc[:len(df) - n_recent].sample(
+            frac=self.model_trainer_config.incremental_resample_fraction,
+            random_state=self.model_trainer_config.random_state
+        )
+        logging.info(f"Incremental sample: {len(recent_df)} recent rows, {len(older_df)} re-sampled older rows")
+        return pd.concat([recent_df, older_df])
+
+    def train_incremental(self) -> Tuple[VehiclePreprocessor, RandomForestClassifier]:
+        """
+        Extends the current production forest instead of refitting it from scratch.
+
+        The production model's preprocessor is reused as-is (its trees were grown on that feature space),
+        the oldest trees are aged out so the forest stays within `max_n_estimators`, and
+        `incremental_n_estimators` new trees are fitted with `warm_start` on recent and re-sampled data.
+        Falls back to a full in-memory fit when there is no production forest to extend.
+        The retained trees never saw the current test split, since split membership is a fixed function
+        of the customer id (see `DataIngestion.split_data_as_train_test`).
+
+        Returns:
+        -------
+        Tuple[VehiclePreprocessor, RandomForestClassifier]
+            The production preprocessor and the extended forest.
+        """
+        try:
+            base_model_file_path = self.model_trainer_config.base_model_file_path
+            if not os.path.exists(base_model_file_path):
+                logging.info(f"No production model at {base_model_file_path}, falling back to a full refit")
+                return self.train_in_memory()
+
+            base_model = load_object(base_model_file_path)
+            forest = getattr(base_model, "trained_model_object", None)
+            if not isinstance(forest, RandomForestClassifier):
+                logging.info("Production model is not a RandomForestClassifier, falling back to a full refit")
+                return self.train_in_memory()
+
+            preprocessor = base_model.preprocessing_object
+            train_df = self.read_split(self.data_ingestion_artifact.train_index_file_path)
+            sample_df = self.select_incremental_sample(train_df)
+            x_sample = preprocessor.transform(sample_df)
+            y_sample = sample_df[TARGET_COLUMN].to_numpy()
+
+            n_new_trees = self.model_trainer_config.incremental_n_estimators
+            n_kept_trees = max(self.model_trainer_config.max_n_estimators - n_new_trees, 0)
+            n_aged_out = max(len(forest.estimators_) - n_kept_trees, 0)
+            forest.estimators_ = forest.estimators_[n_aged_out:]
+            logging.info(f"Keeping {len(forest.estimators_)} production trees, aged out {n_aged_out}, "
+                         f"adding {n_new_trees}")
+
+            forest.set_params(warm_start=True, n_estimators=len(forest.estimators_) + n_new_trees, n_jobs=-1)
+            forest.fit(x_sample, y_sample)
+            forest.set_params(warm_start=False)
+            self.warm_started = True
+            return preprocessor, forest
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def write_incremental_report(self, metric_artifact: ClassificationMetricArtifact, accuracy: float,
+                                 training_seconds: float) -> str:
+        """
+        Refits a forest from scratch on the same training split, evaluates it on the same test split and
+        writes the training time saved and the metric differences of the incremental model to a YAML report.
+        The refit uses its own `full_refit_*` array stores so the stores of the model being saved are kept.
+
+        Returns:
+        -------
+        str
+            Path of the written report.
+        """
+        try:
+            logging.info("Running full refit to compare against the incremental model")
+            start_time = time.perf_counter()
+            full_preprocessor, full_model = self.train_in_memory(store_name="full_refit_train")
+            full_training_seconds = time.perf_counter() - start_time
+            full_metric_artifact, full_accuracy = self.evaluate(
+                MyModel(preprocessing_object=full_preprocessor, trained_model_object=full_model),
+                store_name="full_refit_test"
+            )
+
+            report = {
+                "incremental_training_seconds": round(training_seconds, 3),
+                "full_refit_training_seconds": round(full_training_seconds, 3),
+                "training_seconds_saved": round(full_training_seconds - training_seconds, 3),
+                "incremental_metrics": {**vars(metric_artifact), "accuracy": accuracy},
+                "full_refit_metrics": {**vars(full_metric_artifact), "accuracy": full_accuracy},
+                "metric_difference": {
+                    "f1_score": metric_artifact.f1_score - full_metric_artifact.f1_score,
+                    "precision_score": metric_artifact.precision_score - full_metric_artifact.precision_score,
+                    "recall_score": metric_artifact.recall_score - full_metric_artifact.recall_score,
+                    "accuracy": accuracy - full_accuracy,
+                },
+            }
+            report_file_path = self.model_trainer_config.incremental_report_file_path
+            write_yaml_file(report_file_path, report, replace=True)
+            logging.info(f"Incremental retrain report: {report}")
+            return report_file_path
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def evaluate(self, my_model: MyModel, store_name: str = "test") -> Tuple[ClassificationMetricArtifact, float]:
+        """
+        Scores the model on the test split: the split is transformed with the model's preprocessor into the
+        array store under `store_name` (shards of at most `chunk_size` rows, so memory stays bounded by the
+        chunk size), then predicted shard by shard from the memory-mapped views while a confusion matrix is
+        accumulated.
+
+        Returns:
+        -------
+        Tuple[ClassificationMetricArtifact, float]
+            Classification metrics and accuracy on the test split.
+        """
+        try:
+            x_test_store, y_test_store = self.transform_split(
+                my_model.preprocessing_object, self.data_ingestion_artifact.test_index_file_path, store_name,
+                shard_rows=min(self.model_trainer_config.shard_rows, self.model_trainer_config.chunk_size)
+            )
+            tp = fp = fn = tn = 0
+            for shard_index in range(x_test_store.num_shards):
+                y_true = y_test_store.shard(shard_index)
+                y_pred = my_model.trained_model_object.predict(x_test_store.shard(shard_index))
+                tp += int(np.sum((y_pred == 1) & (y_true == 1)))
+                fp += int(np.sum((y_pred == 1) & (y_true == 0)))
+                fn += int(np.sum((y_pred == 0) & (y_true == 1)))
+                tn += int(np.sum((y_pred == 0) & (y_true == 0)))
+
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            accuracy = (tp + tn) / max(tp + fp + fn + tn, 1)
+            metric_artifact = ClassificationMetricArtifact(f1_score=f1, precision_score=precision, recall_score=recall)
+            return metric_artifact, accuracy
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        """
+        Trains the model in the configured mode, evaluates it on the test split and saves it.
+
+        Returns:
+        -------
+        ModelTrainerArtifact
+            Path of the trained model and its test metrics.
+
+        Raises:
+        ------
+        MyException
+            If training fails or the model does not reach the expected accuracy.
+        """
+        try:
+            training_mode = self.model_trainer_config.training_mode
+            logging.info(f"Starting model training in '{training_mode}' mode")
+            start_time = time.perf_counter()
+            if training_mode == "in_memory":
+                preprocessor, trained_model = self.train_in_memory()
+            elif training_mode == "out_of_core":
+                preprocessor, trained_model = self.train_out_of_core()
+            elif training_mode == "incremental":
+                preprocessor, trained_model = self.train_incremental()
+            else:
+                raise ValueError(f"Unknown training mode: {training_mode}")
+            training_seconds = time.perf_counter() - start_time
+
+            my_model = MyModel(preprocessing_object=preprocessor, trained_model_object=trained_model)
+            metric_artifact, accuracy = self.evaluate(my_model)
+            logging.info(f"Test metrics: {metric_artifact}, accuracy: {accuracy}")
+
+            incremental_report_file_path = None
+            if self.warm_started and self.model_trainer_config.incremental_compare_full_refit:
+                incremental_report_file_path = self.write_incremental_report(metric_artifact, accuracy,
+                                                                             training_seconds)
+
+            if accuracy < self.model_trainer_config.expected_accuracy:
+                logging.info("No model found with score above the base score")
+                raise Exception("No model found with score above the base score")
+
+            save_object(self.model_trainer_config.trained_model_file_path, my_model)
+            logging.info("Saved final model object that includes both preprocessing and the trained model")
+
+            model_trainer_artifact = ModelTrainerArtifact(
+                trained_model_file_path=self.model_trainer_config.trained_model_file_path,
+                metric_artifact=metric_artifact,
+                incremental_report_file_path=incremental_report_file_path
+            )
+            logging.info(f"Model trainer artifact: {model_trainer_artifact}")
+            return model_trainer_artifact
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -16,8 +16,8 @@ CURRENT_YEAR = date.today().year
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 
 FILE_NAME: str = "data.csv"
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+TRAIN_INDEX_FILE_NAME: str = "train_index.npy"
+TEST_INDEX_FILE_NAME: str = "test_index.npy"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
 
@@ -34,6 +34,12 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.25
+DATA_INGESTION_RANDOM_STATE: int = 42
+DATA_INGESTION_DEDUPLICATE: bool = True
+DATA_INGESTION_DEDUP_KEY: str = "id"  # "id" or "content" (hash of the whole row)
+DATA_INGESTION_BATCH_SIZE: int = 10_000
+DATA_INGESTION_BUILD_ONLINE_STORE: bool = True
+DATA_INGESTION_ONLINE_STORE_DIR: str = os.path.join(ARTIFACT_DIR, "online_store")
 
 """
 Data Validation realted contant start with DATA_VALIDATION VAR NAME
@@ -47,6 +53,8 @@ Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+DATA_TRANSFORMATION_SHARD_ROWS: int = 500_000
+DATA_TRANSFORMATION_DOWNCAST: bool = True
 
 """
 MODEL TRAINER related constant start with MODEL_TRAINER var name
@@ -62,6 +70,16 @@ MODEL_TRAINER_MIN_SAMPLES_LEAF: int = 6
 MIN_SAMPLES_SPLIT_MAX_DEPTH: int = 10
 MIN_SAMPLES_SPLIT_CRITERION: str = 'entropy'
 MIN_SAMPLES_SPLIT_RANDOM_STATE: int = 101
+MODEL_TRAINER_TRAINING_MODE: str = "in_memory"  # "in_memory", "out_of_core" or "incremental"
+MODEL_TRAINER_CHUNK_SIZE: int = 50_000
+MODEL_TRAINER_OUT_OF_CORE_EPOCHS: int = 5
+MODEL_TRAINER_INCREMENTAL_N_ESTIMATORS: int = 50
+MODEL_TRAINER_MAX_N_ESTIMATORS: int = 300
+MODEL_TRAINER_INCREMENTAL_RECENT_FRACTION: float = 0.2
+MODEL_TRAINER_INCREMENTAL_RESAMPLE_FRACTION: float = 0.1
+# Benchmarking switch: also runs a full refit after each incremental retrain, roughly doubling its cost
+MODEL_TRAINER_INCREMENTAL_COMPARE_FULL_REFIT: bool = False
+MODEL_TRAINER_INCREMENTAL_REPORT_FILE_NAME: str = "incremental_report.yaml"
 
 """
 MODEL Evaluation related constants
@@ -71,5 +89,39 @@ MODEL_BUCKET_NAME = "my-model-mlopsproj"
 MODEL_PUSHER_S3_KEY = "model-registry"
 
 
+"""
+Prediction service related constants
+"""
+SERVING_MODEL_DIR: str = os.path.join(ARTIFACT_DIR, "production_model")
+SERVING_MODEL_FILE_PATH: str = os.path.join(SERVING_MODEL_DIR, MODEL_FILE_NAME)
+SHADOW_MODEL_FILE_PATH: str = os.path.join(ARTIFACT_DIR, "shadow_model", MODEL_FILE_NAME)
+SHADOW_SAMPLE_FRACTION: float = 0.1
+SHADOW_MAX_WORKERS: int = 1
+SHADOW_MAX_PENDING: int = 32
+SHADOW_LATENCY_WINDOW: int = 10_000
+SHARED_MODEL_DIR: str = os.path.join(ARTIFACT_DIR, "shared_model")
+SHARED_MODEL_DIR_ENV_KEY = "SHARED_MODEL_DIR"
+APP_WORKERS_ENV_KEY = "APP_WORKERS"
+BATCH_PREDICTION_CHUNK_ROWS: int = 10_000
+
+"""
+Artifact store related constants
+"""
+ARTIFACT_STORE_BLOB_DIR: str = os.path.join(ARTIFACT_DIR, ".blobs")
+ARTIFACT_STORE_DEDUPLICATE_RUNS: bool = True
+ARTIFACT_STORE_KEEP_LAST_RUNS: int = 5
+ARTIFACT_STORE_PUSHED_MARKER_FILE_NAME: str = ".pushed"
+
+"""
+Profiling related constants
+"""
+PROFILING_ENV_KEY = "PROFILING"
+PROFILING_REQUEST_FRACTION_ENV_KEY = "PROFILING_REQUEST_FRACTION"
+PROFILING_DIR_NAME: str = "profiles"
+PROFILING_REQUEST_DIR: str = os.path.join(ARTIFACT_DIR, PROFILING_DIR_NAME, "requests")
+PROFILING_TOP_N: int = 30
+PROFILING_SAMPLE_INTERVAL: float = 0.005
+
+
 APP_HOST = "0.0.0.0"
 APP_PORT = 5000
\ No newline at end of file
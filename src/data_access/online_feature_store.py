@@ -0,0 +1,257 @@
+import os
+import sys
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.constants import TARGET_COLUMN
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+
+CURRENT_POINTER_FILE_NAME = "CURRENT"
+MANIFEST_FILE_NAME = "manifest.yaml"
+ID_ARRAY_FILE_NAME = "ids.npy"
+
+
+@dataclass(frozen=True)
+class OnlineStoreSnapshot:
+    """
+    One loaded version of the store. Lookups read a single snapshot, so a concurrent refresh can never
+    mix the id array of one version with the column arrays of another.
+    """
+    version: str
+    id_column: str
+    ids: np.ndarray
+    columns: dict
+    categories: dict
+
+
+class OnlineFeatureStore:
+    """
+    A read-only online store of customer features keyed by `id`.
+
+    The store is a directory of fixed-width columnar `.npy` arrays (one per feature) plus a sorted
+    `id` array, all memory-mapped on load so lookups do not need a database round trip. Categorical
+    columns are stored as integer codes and decoded through the vocabulary kept in the manifest.
+
+    Each build writes a new version directory and then atomically swaps the `CURRENT` pointer,
+    so readers never observe a half-written store.
+    """
+
+    def __init__(self, store_dir: str) -> None:
+        """
+        Parameters:
+        ----------
+        store_dir : str
+            Root directory of the online store.
+        """
+        self.store_dir = store_dir
+        self.snapshot: Optional[OnlineStoreSnapshot] = None
+
+    @staticmethod
+    def build(feature_store_file_path: str, store_dir: str, id_column: str = "id") -> str:
+        """
+        Builds a new version of the store from the feature store CSV and atomically makes it current.
+        The CSV is read one column at a time, so memory is bounded by the id array plus a single column.
+
+        Parameters:
+        ----------
+        feature_store_file_path : str
+            Feature store CSV; must contain `id_column`. The target column is not stored.
+        store_dir : str
+            Root directory of the online store.
+        id_column : str
+            Name of the customer id column.
+
+        Returns:
+        -------
+        str
+            Path of the newly published version directory.
+
+        Raises:
+        ------
+        MyException
+            If the store cannot be built or published.
+        """
+        try:
+            header = pd.read_csv(feature_store_file_path, nrows=0).columns
+            feature_columns = [str(column) for column in header if column not in (id_column, TARGET_COLUMN)]
+
+            # Row positions of the last occurrence of each id, in id order
+            ids = pd.to_numeric(pd.read_csv(feature_store_file_path, usecols=[id_column])[id_column],
+                                errors="coerce")
+            rows = np.flatnonzero(ids.notna().to_numpy())
+            ids = ids.to_numpy()[rows].astype(np.int64)
+            order = np.argsort(ids, kind="stable")
+            ids, rows = ids[order], rows[order]
+            is_last = np.append(ids[1:] != ids[:-1], True)
+            ids, rows = ids[is_last], rows[is_last]
+
+            version = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            version_dir = os.path.join(store_dir, version)
+            tmp_dir = f"{version_dir}.tmp"
+            os.makedirs(tmp_dir, exist_ok=True)
+
+            np.save(os.path.join(tmp_dir, ID_ARRAY_FILE_NAME), ids)
+
+            manifest = {
+                "id_column": id_column,
+                "num_rows": int(len(ids)),
+                "column_order": feature_columns,
+                "columns": {},
+            }
+            for column in feature_columns:
+                series = pd.read_csv(feature_store_file_path, usecols=[column])[column].iloc[rows]
+                if pd.api.types.is_numeric_dtype(series):
+                    values = series.to_numpy()
+                    manifest["columns"][column] = {"kind": "numeric", "dtype": str(values.dtype)}
+                else:
+                    categorical = series.astype("category")
+                    values = categorical.cat.codes.to_numpy(dtype=np.int16)
+                    manifest["columns"][column] = {
+                        "kind": "categorical",
+                        "dtype": str(values.dtype),
+                        "categories": [str(c) for c in categorical.cat.categories],
+                    }
+                np.save(os.path.join(tmp_dir, f"{column}.npy"), values)
+
+            write_yaml_file(os.path.join(tmp_dir, MANIFEST_FILE_NAME), manifest)
+            os.rename(tmp_dir, version_dir)
+
+            # Publish the new version by atomically replacing the pointer file
+            pointer_path = os.path.join(store_dir, CURRENT_POINTER_FILE_NAME)
+            with open(f"{pointer_path}.tmp", "w") as file:
+                file.write(version)
+            os.replace(f"{pointer_path}.tmp", pointer_path)
+            logging.info(f"Online feature store version {version} published with {len(ids)} rows")
+
+            OnlineFeatureStore._prune_old_versions(store_dir, keep=(version,))
+            return version_dir
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def _prune_old_versions(store_dir: str, keep: tuple) -> None:
+        """
+        Removes every version directory except the ones in `keep` and the one published before them,
+        so readers that mapped the previous version keep a valid copy until they refresh.
+        """
+        versions = sorted(
+            name for name in os.listdir(store_dir)
+            if os.path.isdir(os.path.join(store_dir, name)) and not name.endswith(".tmp")
+        )
+        retained = set(keep)
+        older = [v for v in versions if v not in retained]
+        for version in older[:-1]:
+            shutil.rmtree(os.path.join(store_dir, version), ignore_errors=True)
+
+    def current_version(self) -> Optional[str]:
+        """
+        Returns the version the `CURRENT` pointer refers to, or None if nothing is published yet.
+        """
+        pointer_path = os.path.join(self.store_dir, CURRENT_POINTER_FILE_NAME)
+        if not os.path.exists(pointer_path):
+            return None
+        with open(pointer_path) as file:
+            return file.read().strip()
+
+    def load(self) -> OnlineStoreSnapshot:
+        """
+        Memory-maps the current version of the store and publishes it as the store's snapshot.
+
+        Raises:
+        ------
+        MyException
+            If no version has been published or the store files cannot be opened.
+        """
+        try:
+            version = self.current_version()
+            if version is None:
+                raise FileNotFoundError(f"No online feature store published under: {self.store_dir}")
+
+            version_dir = os.path.join(self.store_dir, version)
+            manifest = read_yaml_file(os.path.join(version_dir, MANIFEST_FILE_NAME))
+            snapshot = OnlineStoreSnapshot(
+                version=version,
+                id_column=manifest["id_column"],
+                ids=np.load(os.path.join(version_dir, ID_ARRAY_FILE_NAME), mmap_mode="r"),
+                columns={
+                    column: np.load(os.path.join(version_dir, f"{column}.npy"), mmap_mode="r")
+                    for column in manifest["column_order"]
+                },
+                categories={
+                    column: spec["categories"]
+                    for column, spec in manifest["columns"].items()
+                    if spec["kind"] == "categorical"
+                },
+            )
+            # A single reference assignment, so readers see either the old or the new snapshot
+            self.snapshot = snapshot
+            logging.info(f"Online feature store version {version} loaded from {version_dir}")
+            return snapshot
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def refresh(self) -> bool:
+        """
+        Re-maps the store if a newer version has been published since the last load.
+
+        Returns:
+        -------
+        bool
+            True if a new version was loaded.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or self.current_version() != snapshot.version:
+            self.load()
+            return True
+        return False
+
+    @staticmethod
+    def _positions(ids: np.ndarray, customer_ids: np.ndarray) -> np.ndarray:
+        """
+        Binary-searches the sorted id array; returns -1 for ids that are not in the store.
+        """
+        positions = np.searchsorted(ids, customer_ids)
+        positions = np.minimum(positions, len(ids) - 1)
+        found = ids[positions] == customer_ids
+        return np.where(found, positions, -1)
+
+    def get_features_as_dataframe(self, customer_ids: list) -> pd.DataFrame:
+        """
+        Looks up the features for the given customer ids.
+
+        Parameters:
+        ----------
+        customer_ids : list
+            Customer ids to look up.
+
+        Returns:
+        -------
+        pd.DataFrame
+            One row per id found in the store, in request order, including the id column.
+        """
+        try:
+            snapshot = self.snapshot or self.load()
+            if len(snapshot.ids) == 0:
+                return pd.DataFrame(columns=[snapshot.id_column, *snapshot.columns])
+
+            requested = np.asarray(customer_ids, dtype=np.int64)
+            positions = self._positions(snapshot.ids, requested)
+            positions = positions[positions >= 0]
+
+            data = {snapshot.id_column: np.asarray(snapshot.ids[positions])}
+            for column, values in snapshot.columns.items():
+                column_values = np.asarray(values[positions])
+                if column in snapshot.categories:
+                    data[column] = pd.Categorical.from_codes(column_values, categories=snapshot.categories[column])
+                else:
+                    data[column] = column_values
+            return pd.DataFrame(data)
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -1,7 +1,7 @@
 import sys
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Iterator, Optional
 
 from src.configuration.mongo_db_connection import MongoDBClient
 from src.constants import DATABASE_NAME
@@ -67,4 +67,47 @@ class VehicleInsuranceData:
             
             return df
         except Exception as e:
-            raise MyException(f"Error retrieving data from MongoDB: {e}", sys) from e
\ No newline at end of file
+            raise MyException(f"Error retrieving data from MongoDB: {e}", sys) from e
+
+    def iter_vehicle_insurance_data(self, collection_name: str, batch_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Streams vehicle insurance data from the specified MongoDB collection as DataFrame batches,
+        so the whole collection never has to be held as a list of documents. Documents are returned in `_id`
+        order, so repeated exports of the same collection stream the same rows in the same order.
+
+        Parameters:
+        ----------
+        collection_name : str
+            Name of the MongoDB collection to retrieve data from.
+        batch_size : int
+            Number of documents per yielded DataFrame.
+
+        Returns:
+        -------
+        Iterator[pd.DataFrame]
+            DataFrame batches with the `_id` column dropped and "na" replaced by NaN.
+        
+        Raises:
+        ------
+        MyException
+            If there is an issue retrieving data from MongoDB or if the collection is empty.
+        """
+        try:
+            collection = self.mongo_client.database[collection_name]
+            # Sort on the indexed `_id` so documents always stream in the same order
+            cursor = collection.find(projection={"_id": False}, batch_size=batch_size).sort("_id", 1)
+            batch = []
+            has_data = False
+            for document in cursor:
+                batch.append(document)
+                if len(batch) == batch_size:
+                    has_data = True
+                    yield pd.DataFrame(batch).replace({"na": np.nan})
+                    batch = []
+            if batch:
+                has_data = True
+                yield pd.DataFrame(batch).replace({"na": np.nan})
+            if not has_data:
+                raise ValueError(f"No data found in collection: {collection_name}")
+        except Exception as e:
+            raise MyException(f"Error retrieving data from MongoDB: {e}", sys) from e
@@ -1,9 +1,13 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class DataIngestionArtifact:
-    training_file_path: str
-    testing_file_path: str
+    feature_store_file_path: str
+    train_index_file_path: str
+    test_index_file_path: str
+    online_store_dir: Optional[str] = None
+    duplicate_count: int = 0
 
 @dataclass
 class DataValidationArtifact:
@@ -11,3 +15,14 @@ class DataValidationArtifact:
     validation_status: bool
     message: str
 
+@dataclass
+class ClassificationMetricArtifact:
+    f1_score: float
+    precision_score: float
+    recall_score: float
+
+@dataclass
+class ModelTrainerArtifact:
+    trained_model_file_path: str
+    metric_artifact: ClassificationMetricArtifact
+    incremental_report_file_path: Optional[str] = None
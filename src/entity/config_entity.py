@@ -2,6 +2,7 @@ import os
 from src.constants import *
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 TIMESTAMP: str = datetime.now().strftime("%m%d%Y__%H%M%S")
 
@@ -18,13 +19,56 @@ training_pipeline_config = TrainingPipelineConfig()
 class DataIngestionConfig:
     data_ingestion_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_INGESTION_DIR_NAME)
     feature_store_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_FEATURE_STORE_DIR, FILE_NAME)
-    training_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TRAIN_FILE_NAME)
-    testing_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_FILE_NAME)
+    train_index_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TRAIN_INDEX_FILE_NAME)
+    test_index_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_INDEX_FILE_NAME)
     train_test_split_ratio: float = DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
+    random_state: int = DATA_INGESTION_RANDOM_STATE
+    deduplicate: bool = DATA_INGESTION_DEDUPLICATE
+    dedup_key: str = DATA_INGESTION_DEDUP_KEY
+    batch_size: int = DATA_INGESTION_BATCH_SIZE
     collection_name: str = DATA_INGESTION_COLLECTION_NAME
+    build_online_store: bool = DATA_INGESTION_BUILD_ONLINE_STORE
+    online_store_dir: str = DATA_INGESTION_ONLINE_STORE_DIR
 
 @dataclass
 class DataValidationConfig:
     data_validation_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_VALIDATION_DIR_NAME)
     validation_report_file_path: str = os.path.join(data_validation_dir, DATA_VALIDATION_REPORT_FILE_NAME)
 
+@dataclass
+class ModelTrainerConfig:
+    model_trainer_dir: str = os.path.join(training_pipeline_config.artifact_dir, MODEL_TRAINER_DIR_NAME)
+    trained_model_file_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRAINED_MODEL_DIR, MODEL_FILE_NAME)
+    expected_accuracy: float = MODEL_TRAINER_EXPECTED_SCORE
+    n_estimators: int = MODEL_TRAINER_N_ESTIMATORS
+    min_samples_split: int = MODEL_TRAINER_MIN_SAMPLES_SPLIT
+    min_samples_leaf: int = MODEL_TRAINER_MIN_SAMPLES_LEAF
+    max_depth: int = MIN_SAMPLES_SPLIT_MAX_DEPTH
+    criterion: str = MIN_SAMPLES_SPLIT_CRITERION
+    random_state: int = MIN_SAMPLES_SPLIT_RANDOM_STATE
+    training_mode: str = MODEL_TRAINER_TRAINING_MODE
+    chunk_size: int = MODEL_TRAINER_CHUNK_SIZE
+    out_of_core_epochs: int = MODEL_TRAINER_OUT_OF_CORE_EPOCHS
+    base_model_file_path: str = SERVING_MODEL_FILE_PATH
+    incremental_n_estimators: int = MODEL_TRAINER_INCREMENTAL_N_ESTIMATORS
+    max_n_estimators: int = MODEL_TRAINER_MAX_N_ESTIMATORS
+    incremental_recent_fraction: float = MODEL_TRAINER_INCREMENTAL_RECENT_FRACTION
+    incremental_resample_fraction: float = MODEL_TRAINER_INCREMENTAL_RESAMPLE_FRACTION
+    incremental_compare_full_refit: bool = MODEL_TRAINER_INCREMENTAL_COMPARE_FULL_REFIT
+    incremental_report_file_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_INCREMENTAL_REPORT_FILE_NAME)
+    transformed_data_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_TRANSFORMATION_DIR_NAME,
+                                             DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR)
+    shard_rows: int = DATA_TRANSFORMATION_SHARD_ROWS
+    downcast: bool = DATA_TRANSFORMATION_DOWNCAST
+
+@dataclass
+class VehiclePredictorConfig:
+    model_file_path: str = SERVING_MODEL_FILE_PATH
+    online_store_dir: str = DATA_INGESTION_ONLINE_STORE_DIR
+    shadow_model_file_path: str = SHADOW_MODEL_FILE_PATH
+    shadow_sample_fraction: float = SHADOW_SAMPLE_FRACTION
+    shadow_max_workers: int = SHADOW_MAX_WORKERS
+    shadow_max_pending: int = SHADOW_MAX_PENDING
+    shadow_latency_window: int = SHADOW_LATENCY_WINDOW
+    # Set by the parent process in multi-worker serving mode, see app.py
+    shared_model_dir: Optional[str] = os.getenv(SHARED_MODEL_DIR_ENV_KEY)
@@ -0,0 +1,112 @@
+import sys
+
+import numpy as np
+from pandas import DataFrame
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_yaml_file
+
+
+class VehiclePreprocessor:
+    """
+    Turns raw vehicle insurance records into the model's feature matrix.
+
+    Mirrors the feature engineering from the experiment notebook: `Gender` is mapped to 0/1,
+    `Vehicle_Age` and `Vehicle_Damage` are one-hot encoded with the first level dropped, `id` is dropped,
+    `num_features` are standard-scaled and `mm_columns` are min-max scaled. The encodings are fixed
+    rather than learned so the preprocessor can be fitted incrementally, one chunk at a time.
+    """
+
+    GENDER_MAPPING = {"Female": 0, "Male": 1}
+    DUMMY_COLUMNS = {
+        "Vehicle_Age_lt_1_Year": ("Vehicle_Age", "< 1 Year"),
+        "Vehicle_Age_gt_2_Years": ("Vehicle_Age", "> 2 Years"),
+        "Vehicle_Damage_Yes": ("Vehicle_Damage", "Yes"),
+    }
+
+    def __init__(self, schema_file_path: str = SCHEMA_FILE_PATH) -> None:
+        try:
+            schema = read_yaml_file(schema_file_path)
+            self.drop_columns = list(schema["drop_columns"])
+            self.num_features = list(schema["num_features"])
+            self.mm_columns = list(schema["mm_columns"])
+            self.standard_scaler = StandardScaler()
+            self.min_max_scaler = MinMaxScaler()
+            self.feature_names = None
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _encode(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Applies the fixed (non-learned) encodings and drops the target and id columns.
+        """
+        df = dataframe.drop(columns=[TARGET_COLUMN, *self.drop_columns], errors="ignore").copy()
+        df["Gender"] = df["Gender"].astype(str).map(self.GENDER_MAPPING)
+        for dummy_column, (source_column, level) in self.DUMMY_COLUMNS.items():
+            df[dummy_column] = (df[source_column].astype(str) == level).astype(np.int8)
+        df = df.drop(columns=sorted({source for source, _ in self.DUMMY_COLUMNS.values()}))
+        if self.feature_names is None:
+            self.feature_names = list(df.columns)
+        return df[self.feature_names]
+
+    def partial_fit(self, dataframe: DataFrame) -> "VehiclePreprocessor":
+        """
+        Updates the scaler statistics with one chunk of raw records.
+        """
+        try:
+            df = self._encode(dataframe)
+            self.standard_scaler.partial_fit(df[self.num_features])
+            self.min_max_scaler.partial_fit(df[self.mm_columns])
+            return self
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def transform(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Transforms raw records into a float feature matrix.
+        """
+        try:
+            df = self._encode(dataframe).astype(np.float64)
+            df[self.num_features] = self.standard_scaler.transform(df[self.num_features])
+            df[self.mm_columns] = self.min_max_scaler.transform(df[self.mm_columns])
+            return df.to_numpy()
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+class MyModel:
+    def __init__(self, preprocessing_object: VehiclePreprocessor, trained_model_object: object):
+        """
+        Bundles the fitted preprocessor with the trained model so raw records can be scored directly.
+
+        Args:
+            preprocessing_object (VehiclePreprocessor): Fitted preprocessing object.
+            trained_model_object (object): Trained estimator exposing `predict`.
+        """
+        self.preprocessing_object = preprocessing_object
+        self.trained_model_object = trained_model_object
+
+    def predict(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Transforms the raw records and returns the model's predictions.
+
+        Args:
+            dataframe (DataFrame): Raw records in the layout of the feature store.
+        Returns:
+            np.ndarray: Predicted responses.
+        """
+        try:
+            logging.info("Starting prediction process.")
+            transformed_feature = self.preprocessing_object.transform(dataframe)
+            return self.trained_model_object.predict(transformed_feature)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def __repr__(self):
+        return f"{type(self.trained_model_object).__name__}()"
+
+    def __str__(self):
+        return f"{type(self.trained_model_object).__name__}()"
@@ -0,0 +1,225 @@
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.shared_estimator import attach_shared_model
+from src.data_access.online_feature_store import OnlineFeatureStore
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import load_object
+from src.utils.profiling import profile_sampled_requests
+
+
+class ShadowScorer:
+    """
+    Scores a sampled fraction of live requests with a challenger model off the request path.
+
+    Sampled requests are handed to a small background executor; at most `max_pending` can be queued or
+    running, and requests arriving while it is saturated are dropped rather than delaying the primary
+    response. Agreement with the primary model's predictions and the latencies of both models (over the last
+    `latency_window` requests) are kept for `stats`.
+    """
+
+    def __init__(self, challenger_model: object, sample_fraction: float, max_workers: int, max_pending: int,
+                 latency_window: int) -> None:
+        self.challenger_model = challenger_model
+        self.sample_fraction = sample_fraction
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow-scorer")
+        self.pending_slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.primary_latencies = deque(maxlen=latency_window)
+        self.challenger_latencies = deque(maxlen=latency_window)
+        self.requests_shadowed = 0
+        self.requests_dropped = 0
+        self.challenger_errors = 0
+        self.rows_compared = 0
+        self.rows_agreed = 0
+
+    def record_primary_latency(self, seconds: float) -> None:
+        self.primary_latencies.append(seconds)
+
+    def submit(self, dataframe: DataFrame, primary_predictions: np.ndarray) -> bool:
+        """
+        Queues a request for challenger scoring if it is sampled and the executor has room.
+
+        Returns:
+            bool: True if the request was queued.
+        """
+        if random.random() >= self.sample_fraction:
+            return False
+        if not self.pending_slots.acquire(blocking=False):
+            with self.lock:
+                self.requests_dropped += 1
+            return False
+        self.executor.submit(self._score, dataframe, primary_predictions)
+        return True
+
+    def _score(self, dataframe: DataFrame, primary_predictions: np.ndarray) -> None:
+        try:
+            start_time = time.perf_counter()
+            challenger_predictions = self.challenger_model.predict(dataframe)
+            self.challenger_latencies.append(time.perf_counter() - start_time)
+            agreed = int(np.sum(np.asarray(challenger_predictions) == np.asarray(primary_predictions)))
+            with self.lock:
+                self.requests_shadowed += 1
+                self.rows_compared += len(primary_predictions)
+                self.rows_agreed += agreed
+        except Exception as e:
+            with self.lock:
+                self.challenger_errors += 1
+            logging.error(f"Shadow scoring failed: {e}")
+        finally:
+            self.pending_slots.release()
+
+    @staticmethod
+    def _percentiles(latencies: deque) -> dict:
+        if not latencies:
+            return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+        p50, p95, p99 = np.percentile(np.fromiter(latencies, dtype=float), [50, 95, 99]) * 1000
+        return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+    def stats(self) -> dict:
+        """
+        Returns the agreement rate, drop counts and latency percentiles of both models.
+        """
+        with self.lock:
+            return {
+                "sample_fraction": self.sample_fraction,
+                "requests_shadowed": self.requests_shadowed,
+                "requests_dropped": self.requests_dropped,
+                "challenger_errors": self.challenger_errors,
+                "rows_compared": self.rows_compared,
+                "agreement_rate": self.rows_agreed / self.rows_compared if self.rows_compared else None,
+                "primary_latency": self._percentiles(self.primary_latencies),
+                "challenger_latency": self._percentiles(self.challenger_latencies),
+            }
+
+
+class VehicleDataClassifier:
+    def __init__(self, prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig()) -> None:
+        """
+        Initializes the classifier used by the prediction service.
+
+        Parameters:
+        ----------
+        prediction_pipeline_config : VehiclePredictorConfig
+            Configuration holding the serving model path and the online feature store location.
+        """
+        try:
+            self.prediction_pipeline_config = prediction_pipeline_config
+            self.model = None
+            self.shadow_scorer = None
+            self.online_store = OnlineFeatureStore(store_dir=prediction_pipeline_config.online_store_dir)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load_model(self) -> object:
+        """
+        Loads the serving model once and keeps it for subsequent requests. In multi-worker serving mode the
+        model is attached from the shared bundle exported by the parent process instead of unpickled privately.
+        """
+        try:
+            if self.model is None:
+                config = self.prediction_pipeline_config
+                if config.shared_model_dir:
+                    logging.info(f"Attaching shared serving model from: {config.shared_model_dir}")
+                    self.model = attach_shared_model(config.shared_model_dir, config.model_file_path)
+                else:
+                    logging.info(f"Loading serving model from: {config.model_file_path}")
+                    self.model = load_object(config.model_file_path)
+                self.load_shadow_scorer()
+            return self.model
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load_shadow_scorer(self) -> Optional[ShadowScorer]:
+        """
+        Enables shadow scoring if a challenger model has been placed at `shadow_model_file_path`.
+        """
+        try:
+            config = self.prediction_pipeline_config
+            if self.shadow_scorer is None and config.shadow_model_file_path \
+                    and os.path.exists(config.shadow_model_file_path):
+                logging.info(f"Loading shadow challenger model from: {config.shadow_model_file_path}")
+                challenger_model = load_object(config.shadow_model_file_path)
+                # Models are saved as trained (e.g. a forest with n_jobs=-1); keep the challenger on one core
+                # so shadow scoring does not compete with primary requests for CPU
+                estimator = getattr(challenger_model, "trained_model_object", challenger_model)
+                for step in getattr(estimator, "named_steps", {}).values() or [estimator]:
+                    if hasattr(step, "n_jobs"):
+                        step.n_jobs = 1
+                self.shadow_scorer = ShadowScorer(
+                    challenger_model=challenger_model,
+                    sample_fraction=config.shadow_sample_fraction,
+                    max_workers=config.shadow_max_workers,
+                    max_pending=config.shadow_max_pending,
+                    latency_window=config.shadow_latency_window
+                )
+            return self.shadow_scorer
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @profile_sampled_requests
+    def predict(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Predicts the response for each row of the given feature DataFrame.
+
+        Parameters:
+        ----------
+        dataframe : DataFrame
+            Raw features, in the layout of the feature store.
+
+        Returns:
+        -------
+        np.ndarray
+            Predicted responses.
+        """
+        try:
+            model = self.load_model()
+            start_time = time.perf_counter()
+            predictions = model.predict(dataframe)
+            if self.shadow_scorer is not None:
+                self.shadow_scorer.record_primary_latency(time.perf_counter() - start_time)
+                self.shadow_scorer.submit(dataframe, predictions)
+            return predictions
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def predict_by_id(self, customer_id: int) -> Optional[int]:
+        """
+        Fetches an existing customer's features from the online feature store and predicts their response.
+
+        Parameters:
+        ----------
+        customer_id : int
+            Customer id to score.
+
+        Returns:
+        -------
+        Optional[int]
+            The predicted response, or None if the customer is not in the online store.
+
+        Raises:
+        ------
+        FileNotFoundError
+            If no online feature store has been published yet.
+        """
+        if self.online_store.current_version() is None:
+            raise FileNotFoundError(f"No online feature store published under: {self.online_store.store_dir}")
+        try:
+            self.online_store.refresh()
+            features = self.online_store.get_features_as_dataframe([customer_id])
+            if features.empty:
+                return None
+            return int(self.predict(features)[0])
+        except Exception as e:
+            raise MyException(e, sys) from e
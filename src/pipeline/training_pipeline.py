@@ -1,22 +1,31 @@
 import sys
+from src.constants import ARTIFACT_STORE_DEDUPLICATE_RUNS
 from src.exception import MyException
 from src.logger import logging
+from src.utils.artifact_store import ArtifactStore
+from src.utils.profiling import profile_stage
 
 from src.components.data_ingestion import DataIngestion
 from src.components.data_validation import DataValidation
+from src.components.model_trainer import ModelTrainer
 
+from src.entity.config_entity import training_pipeline_config
 from src.entity.config_entity import DataIngestionConfig
 from src.entity.config_entity import DataValidationConfig
+from src.entity.config_entity import ModelTrainerConfig
 
 from src.entity.artifact_entity import DataIngestionArtifact
 from src.entity.artifact_entity import DataValidationArtifact
+from src.entity.artifact_entity import ModelTrainerArtifact
 
 
 class TrainingPipeline:
     def __init__(self):
         self.data_ingestion_config = DataIngestionConfig()
         self.data_validation_config = DataValidationConfig()
+        self.model_trainer_config = ModelTrainerConfig()
     
+    @profile_stage
     def start_data_ingestion(self) -> DataIngestionArtifact:
         """
         Starts the data ingestion process.
@@ -40,6 +49,7 @@ class TrainingPipeline:
         except Exception as e:
             raise MyException(e, sys) from e
         
+    @profile_stage
     def start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
         """
         Starts the data validation process.
@@ -69,6 +79,36 @@ class TrainingPipeline:
         except Exception as e:
             raise MyException(e, sys) from e
 
+    @profile_stage
+    def start_model_trainer(self, data_ingestion_artifact: DataIngestionArtifact) -> ModelTrainerArtifact:
+        """
+        Starts the model training process.
+        
+        Args:
+            data_ingestion_artifact (DataIngestionArtifact): The artifact from data ingestion step.
+        
+        Returns:
+        -------
+        ModelTrainerArtifact
+            The artifact produced by the model training process.
+        
+        Raises:
+        ------
+        MyException
+            If there is an issue during model training.
+        """
+        try:
+            logging.info("Starting model training process")
+            model_trainer = ModelTrainer(
+                data_ingestion_artifact=data_ingestion_artifact,
+                model_trainer_config=self.model_trainer_config
+            )
+            model_trainer_artifact = model_trainer.initiate_model_trainer()
+            logging.info(f"Model training completed successfully: {model_trainer_artifact}")
+            return model_trainer_artifact
+        except Exception as e:
+            raise MyException(e, sys) from e
+
 
 
     def run_pipeline(self)-> None:
@@ -84,6 +124,11 @@ class TrainingPipeline:
             logging.info("Running the training pipeline")
             data_ingestion_artifact = self.start_data_ingestion()
             data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
+            if not data_validation_artifact.validation_status:
+                raise Exception(data_validation_artifact.message)
+            model_trainer_artifact = self.start_model_trainer(data_ingestion_artifact=data_ingestion_artifact)
+            if ARTIFACT_STORE_DEDUPLICATE_RUNS:
+                ArtifactStore().store_run(training_pipeline_config.artifact_dir)
             logging.info("Training pipeline executed successfully")
         except Exception as e:
             raise MyException(e, sys) from e
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+import sys
+from typing import Iterator, Optional
+
+import numpy as np
+
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+
+ARRAY_STORE_MANIFEST_FILE_NAME = "manifest.yaml"
+
+
+class ShardedArrayWriter:
+    """
+    Writes a 1-D or 2-D array to disk as row shards (`shard_00000.npy`, ...) while data streams in.
+
+    Rows are buffered until `shard_rows` are available, optionally cast to `dtype` (e.g. float32 features,
+    int8 targets), and flushed as one shard. The manifest is written last by `close`, so a store without a
+    manifest is incomplete and is never read.
+    """
+
+    def __init__(self, store_dir: str, shard_rows: int, dtype: Optional[str] = None) -> None:
+        """
+        Args:
+            store_dir (str): Directory of the store; created if needed.
+            shard_rows (int): Maximum number of rows per shard.
+            dtype (Optional[str]): dtype to store the data in; the incoming dtype if None.
+        """
+        self.store_dir = store_dir
+        self.shard_rows = shard_rows
+        self.dtype = dtype
+        self.shards = []
+        self._buffer = []
+        self._buffered_rows = 0
+        self._row_shape = None
+        os.makedirs(store_dir, exist_ok=True)
+
+    def append(self, array: np.ndarray) -> None:
+        """
+        Appends rows to the store.
+        """
+        try:
+            array = np.asarray(array, dtype=self.dtype)
+            self._row_shape = array.shape[1:]
+            self.dtype = self.dtype or array.dtype.str
+            self._buffer.append(array)
+            self._buffered_rows += len(array)
+            while self._buffered_rows >= self.shard_rows:
+                self._flush(self.shard_rows)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _flush(self, n_rows: int) -> None:
+        data = np.concatenate(self._buffer) if len(self._buffer) > 1 else self._buffer[0]
+        shard, rest = data[:n_rows], data[n_rows:]
+        shard_file_name = f"shard_{len(self.shards):05d}.npy"
+        shard_file_path = os.path.join(self.store_dir, shard_file_name)
+        # Write next to the target and rename, so readers still mapping a previous shard keep a valid file
+        with open(f"{shard_file_path}.tmp", "wb") as file_obj:
+            np.save(file_obj, shard)
+        os.replace(f"{shard_file_path}.tmp", shard_file_path)
+        self.shards.append({"file_name": shard_file_name, "rows": int(len(shard))})
+        self._buffer = [rest] if len(rest) else []
+        self._buffered_rows = len(rest)
+
+    def close(self) -> "ShardedArray":
+        """
+        Flushes the remaining rows, writes the manifest and returns a reader over the store.
+        """
+        try:
+            if self._buffered_rows:
+                self._flush(self._buffered_rows)
+            manifest = {
+                "dtype": np.dtype(self.dtype).str if self.dtype else None,
+                "row_shape": list(self._row_shape or ()),
+                "rows": int(sum(shard["rows"] for shard in self.shards)),
+                "shards": self.shards,
+            }
+            write_yaml_file(os.path.join(self.store_dir, ARRAY_STORE_MANIFEST_FILE_NAME), manifest, replace=True)
+            logging.info(f"Array store written at {self.store_dir}: {manifest['rows']} rows "
+                         f"in {len(self.shards)} shards")
+            return ShardedArray(self.store_dir)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+class ShardedArray:
+    """
+    Reads a store written by `ShardedArrayWriter`. Shards are memory-mapped by default, so reads are views on
+    the page cache rather than private copies, and any shard can be accessed on its own.
+    """
+
+    def __init__(self, store_dir: str, mmap_mode: Optional[str] = "r") -> None:
+        """
+        Args:
+            store_dir (str): Directory of the store.
+            mmap_mode (Optional[str]): Passed to `np.load`; None loads shards into memory.
+        """
+        try:
+            self.store_dir = store_dir
+            self.mmap_mode = mmap_mode
+            self.manifest = read_yaml_file(os.path.join(store_dir, ARRAY_STORE_MANIFEST_FILE_NAME))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.manifest["shards"])
+
+    def shard(self, index: int) -> np.ndarray:
+        """
+        Returns one shard.
+        """
+        file_name = self.manifest["shards"][index]["file_name"]
+        return np.load(os.path.join(self.store_dir, file_name), mmap_mode=self.mmap_mode)
+
+    def iter_shards(self) -> Iterator[np.ndarray]:
+        for index in range(self.num_shards):
+            yield self.shard(index)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Returns the whole array. A single-shard store is returned as the memory-mapped view itself;
+        several shards are concatenated into memory.
+        """
+        if self.num_shards == 1:
+            return self.shard(0)
+        if self.num_shards == 0:
+            return np.empty((0, *self.manifest["row_shape"]), dtype=self.manifest["dtype"])
+        return np.concatenate(list(self.iter_shards()))
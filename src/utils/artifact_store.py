@@ -0,0 +1,200 @@
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+from datetime import datetime
+
+from src.constants import (ARTIFACT_DIR, ARTIFACT_STORE_BLOB_DIR, ARTIFACT_STORE_KEEP_LAST_RUNS,
+                           ARTIFACT_STORE_PUSHED_MARKER_FILE_NAME)
+from src.exception import MyException
+from src.logger import logging
+
+RUN_DIR_PATTERN = re.compile(r".*_(\d{8}__\d{6})$")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content.
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(HASH_CHUNK_SIZE), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Content-addressed blob store for pipeline run artifacts.
+
+    Every file of a run directory (`artifact/<PIPELINE_NAME>_<TIMESTAMP>/...`) is hashed and replaced by a
+    hard link to `artifact/.blobs/<aa>/<sha256>`, so files that are identical across runs are stored once.
+    A blob whose only remaining link is the store's own is unreferenced and is removed by `gc`.
+
+    Blobs are made read-only and the pipeline's writers (`src.utils.main_utils.atomic_write`) replace files
+    instead of rewriting them in place, so rewriting a stored path detaches it from its blob rather than
+    changing the content every linked run shares.
+    """
+
+    def __init__(self, artifact_dir: str = ARTIFACT_DIR, blob_dir: str = ARTIFACT_STORE_BLOB_DIR) -> None:
+        self.artifact_dir = artifact_dir
+        self.blob_dir = blob_dir
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def list_runs(self) -> list:
+        """
+        Returns the run directories under the artifact dir, oldest first.
+        """
+        runs = []
+        if not os.path.isdir(self.artifact_dir):
+            return runs
+        for name in os.listdir(self.artifact_dir):
+            match = RUN_DIR_PATTERN.match(name)
+            run_dir = os.path.join(self.artifact_dir, name)
+            if match and os.path.isdir(run_dir):
+                runs.append((datetime.strptime(match.group(1), "%m%d%Y__%H%M%S"), run_dir))
+        return [run_dir for _, run_dir in sorted(runs)]
+
+    def store_run(self, run_dir: str) -> dict:
+        """
+        Moves the files of a run directory into the blob store, leaving hard links in their place.
+
+        Args:
+            run_dir (str): The run's artifact directory.
+        Returns:
+            dict: Number of files stored and bytes saved by linking to already existing blobs.
+        """
+        try:
+            files_stored = 0
+            bytes_deduplicated = 0
+            for root, _, file_names in os.walk(run_dir):
+                for file_name in file_names:
+                    file_path = os.path.join(root, file_name)
+                    if os.path.islink(file_path) or file_name == ARTIFACT_STORE_PUSHED_MARKER_FILE_NAME:
+                        continue
+                    blob_path = self.blob_path(file_digest(file_path))
+                    if os.path.exists(blob_path):
+                        if os.path.samefile(blob_path, file_path):
+                            continue
+                        bytes_deduplicated += os.path.getsize(file_path)
+                        tmp_path = f"{file_path}.link"
+                        os.link(blob_path, tmp_path)
+                        os.replace(tmp_path, file_path)
+                    else:
+                        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                        os.link(file_path, blob_path)
+                        os.chmod(blob_path, 0o444)
+                    files_stored += 1
+            report = {"run_dir": run_dir, "files_stored": files_stored, "bytes_deduplicated": bytes_deduplicated}
+            logging.info(f"Run artifacts stored in blob store: {report}")
+            return report
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def mark_pushed(run_dir: str) -> None:
+        """
+        Marks a run whose model was pushed to production, so `gc` always retains it.
+        """
+        open(os.path.join(run_dir, ARTIFACT_STORE_PUSHED_MARKER_FILE_NAME), "w").close()
+
+    @staticmethod
+    def is_pushed(run_dir: str) -> bool:
+        """
+        A run counts as pushed only if it carries the pushed marker. Matching on model content is not used:
+        seeded retrains produce byte-identical models, which would make every such run look pushed.
+        """
+        return os.path.exists(os.path.join(run_dir, ARTIFACT_STORE_PUSHED_MARKER_FILE_NAME))
+
+    def gc(self, keep_last: int = ARTIFACT_STORE_KEEP_LAST_RUNS, keep_pushed: bool = True,
+           dry_run: bool = False) -> dict:
+        """
+        Deletes the run directories outside the retention policy, then every blob no run references anymore.
+
+        Args:
+            keep_last (int): Number of most recent runs to keep.
+            keep_pushed (bool): Whether to keep every run marked as pushed (see `mark_pushed`).
+            dry_run (bool): Only compute the report, do not delete anything.
+        Returns:
+            dict: The runs removed and kept, and the number of bytes reclaimed.
+        """
+        try:
+            runs = self.list_runs()
+            recent = set(runs[-keep_last:]) if keep_last > 0 else set()
+            kept, removed = [], []
+            for run_dir in runs:
+                if run_dir in recent or (keep_pushed and self.is_pushed(run_dir)):
+                    kept.append(run_dir)
+                else:
+                    removed.append(run_dir)
+
+            # Files linked into the blob store free space only once their blob has no other link
+            bytes_reclaimed = 0
+            removed_links = {}
+            for run_dir in removed:
+                for root, _, file_names in os.walk(run_dir):
+                    for file_name in file_names:
+                        stat = os.lstat(os.path.join(root, file_name))
+                        if stat.st_nlink == 1:
+                            bytes_reclaimed += stat.st_size
+                        else:
+                            removed_links[stat.st_ino] = removed_links.get(stat.st_ino, 0) + 1
+                if not dry_run:
+                    shutil.rmtree(run_dir)
+
+            blobs_removed = 0
+            if os.path.isdir(self.blob_dir):
+                for root, _, file_names in os.walk(self.blob_dir):
+                    for file_name in file_names:
+                        blob_path = os.path.join(root, file_name)
+                        stat = os.stat(blob_path)
+                        remaining_links = stat.st_nlink - (removed_links.get(stat.st_ino, 0) if dry_run else 0)
+                        if remaining_links <= 1:
+                            bytes_reclaimed += stat.st_size
+                            blobs_removed += 1
+                            if not dry_run:
+                                os.remove(blob_path)
+
+            report = {
+                "runs_removed": removed,
+                "runs_kept": kept,
+                "blobs_removed": blobs_removed,
+                "bytes_reclaimed": bytes_reclaimed,
+                "dry_run": dry_run,
+            }
+            logging.info(f"Artifact store GC: removed {len(removed)} runs and {blobs_removed} blobs, "
+                         f"reclaimed {bytes_reclaimed / 1024 ** 2:.2f} MB")
+            return report
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garbage-collect old pipeline runs from the artifact store.")
+    parser.add_argument("--keep-last", type=int, default=ARTIFACT_STORE_KEEP_LAST_RUNS,
+                        help="number of most recent runs to keep")
+    parser.add_argument("--no-keep-pushed", action="store_true",
+                        help="also remove runs whose model was pushed, unless they are among the last runs")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be reclaimed without deleting")
+    parser.add_argument("--mark-pushed", metavar="RUN_DIR",
+                        help="mark a run whose model was pushed to production, then exit")
+    args = parser.parse_args()
+
+    if args.mark_pushed:
+        ArtifactStore.mark_pushed(args.mark_pushed)
+        print(f"marked as pushed: {args.mark_pushed}")
+        sys.exit(0)
+
+    gc_report = ArtifactStore().gc(keep_last=args.keep_last, keep_pushed=not args.no_keep_pushed,
+                                   dry_run=args.dry_run)
+    for run_dir in gc_report["runs_removed"]:
+        print(f"removed: {run_dir}")
+    print(f"runs kept: {len(gc_report['runs_kept'])}, runs removed: {len(gc_report['runs_removed'])}, "
+          f"blobs removed: {gc_report['blobs_removed']}, "
+          f"space reclaimed: {gc_report['bytes_reclaimed'] / 1024 ** 2:.2f} MB"
+          f"{' (dry run)' if gc_report['dry_run'] else ''}")
@@ -0,0 +1,139 @@
+import io
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as pd_types
+
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from src.utils.main_utils import read_yaml_file
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pyarrow is in requirements.txt; without it only NDJSON payloads are accepted
+    pa = None
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_CONTENT_TYPE = "application/vnd.apache.arrow.file"
+ARROW_CONTENT_TYPES = (ARROW_STREAM_CONTENT_TYPE, ARROW_FILE_CONTENT_TYPE)
+
+
+def read_column_specs(schema_file_path: str = SCHEMA_FILE_PATH) -> list:
+    """
+    Returns the `(column, type)` pairs of the schema that a batch must provide (every column but the target).
+    """
+    return [
+        next(iter(column_spec.items()))
+        for column_spec in read_yaml_file(schema_file_path)["columns"]
+        if next(iter(column_spec)) != TARGET_COLUMN
+    ]
+
+
+# Parsed once at import, so batch requests do not re-read the schema
+BATCH_COLUMN_SPECS = read_column_specs()
+
+
+class UnsupportedBatchFormat(Exception):
+    """
+    Raised for a content type the batch endpoint cannot read (or Arrow without pyarrow installed).
+    """
+
+
+def _media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def batch_format(content_type: Optional[str]) -> str:
+    """
+    Maps a request content type to "ndjson" or "arrow".
+    """
+    media_type = _media_type(content_type)
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    if media_type in ARROW_CONTENT_TYPES:
+        if pa is None:
+            raise UnsupportedBatchFormat("Arrow payloads require pyarrow, which is not installed")
+        return "arrow"
+    raise UnsupportedBatchFormat(
+        f"Unsupported content type {media_type!r}; use one of {NDJSON_CONTENT_TYPES + ARROW_CONTENT_TYPES}")
+
+
+def read_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    """
+    Parses an NDJSON body (one JSON object per line) or an Arrow IPC stream/file body into a DataFrame.
+    """
+    if batch_format(content_type) == "ndjson":
+        if not body.strip():
+            return pd.DataFrame()
+        return pd.read_json(io.BytesIO(body), lines=True, dtype=False)
+    reader = pa.ipc.open_file(body) if _media_type(content_type) == ARROW_FILE_CONTENT_TYPE else \
+        pa.ipc.open_stream(body)
+    return reader.read_all().to_pandas()
+
+
+def validate_batch_columns(dataframe: pd.DataFrame, column_specs: list = BATCH_COLUMN_SPECS) -> list:
+    """
+    Checks a batch of records against the column types of the schema, one vectorised check per column.
+
+    Args:
+        dataframe (pd.DataFrame): The parsed batch.
+        column_specs (list): `(column, int|float|category)` pairs, by default those of `config/schema.yaml`.
+    Returns:
+        list: Error messages; empty if the batch is valid.
+    """
+    errors = []
+    if dataframe.empty:
+        return ["Batch contains no records"]
+    for column, column_type in column_specs:
+        if column not in dataframe.columns:
+            errors.append(f"Column '{column}' is missing")
+            continue
+
+        values = dataframe[column]
+        n_null = int(values.isna().sum())
+        if n_null:
+            errors.append(f"Column '{column}' has {n_null} missing values")
+        if column_type == "category":
+            if pd_types.infer_dtype(values, skipna=True) != "string":
+                errors.append(f"Column '{column}' must contain strings")
+        elif pd_types.is_bool_dtype(values) or not pd_types.is_numeric_dtype(values):
+            errors.append(f"Column '{column}' must be numeric")
+        elif column_type == "int" and not pd_types.is_integer_dtype(values):
+            n_fractional = int(np.count_nonzero(values.notna() & (values % 1 != 0)))
+            if n_fractional:
+                errors.append(f"Column '{column}' has {n_fractional} non-integer values")
+    return errors
+
+
+def write_ndjson_chunks(chunks: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Serialises prediction chunks as NDJSON, one line per record.
+    """
+    for chunk in chunks:
+        yield chunk.to_json(orient="records", lines=True).rstrip("\n").encode() + b"\n"
+
+
+def write_arrow_chunks(chunks: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Serialises prediction chunks as one Arrow IPC stream, emitting each record batch as it is written.
+    """
+    sink = io.BytesIO()
+    writer = None
+    for chunk in chunks:
+        batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        writer.write_batch(batch)
+        yield _drain(sink)
+    if writer is not None:
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -0,0 +1,171 @@
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.exception import MyException
+from src.logger import logging
+
+_EMPTY_SLOT = np.iinfo(np.int64).min
+_FIBONACCI_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class Int64HashSet:
+    """
+    A NumPy-backed open-addressing hash set of int64 keys with vectorized batch inserts.
+
+    Keys live in a single int64 table (linear probing, Fibonacci hashing), so memory is 8 bytes per slot
+    and the table is kept at most `max_load` full by doubling.
+    """
+
+    def __init__(self, initial_capacity: int = 1 << 16, max_load: float = 0.5) -> None:
+        capacity = 1 << max(int(initial_capacity - 1).bit_length(), 4)
+        self.table = np.full(capacity, _EMPTY_SLOT, dtype=np.int64)
+        self.max_load = max_load
+        self.size = 0
+        self._contains_empty_key = False
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        bits = len(self.table).bit_length() - 1
+        return ((keys.view(np.uint64) * _FIBONACCI_MULTIPLIER) >> np.uint64(64 - bits)).astype(np.int64)
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = len(self.table)
+        while capacity * self.max_load < min_capacity:
+            capacity *= 2
+        if capacity == len(self.table):
+            return
+        existing = self.table[self.table != _EMPTY_SLOT]
+        self.table = np.full(capacity, _EMPTY_SLOT, dtype=np.int64)
+        self._insert_unique(existing)
+        logging.debug(f"Int64HashSet grown to {capacity} slots")
+
+    def _insert_unique(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Inserts distinct keys, returning a mask of the ones that were not in the set yet.
+        """
+        inserted = np.zeros(len(keys), dtype=bool)
+        slots = self._slots(keys)
+        mask = len(self.table) - 1
+        pending = np.arange(len(keys))
+        while pending.size:
+            pending_slots = slots[pending]
+            current = self.table[pending_slots]
+            found = current == keys[pending]
+            empty = current == _EMPTY_SLOT
+
+            # Several pending keys may target the same empty slot; the first one claims it
+            claimants = pending[empty]
+            _, first = np.unique(pending_slots[empty], return_index=True)
+            winners = claimants[first]
+            self.table[slots[winners]] = keys[winners]
+            inserted[winners] = True
+
+            resolved = found.copy()
+            resolved[np.flatnonzero(empty)[first]] = True
+            pending = pending[~resolved]
+            slots[pending] = (slots[pending] + 1) & mask
+        return inserted
+
+    def add_batch(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Adds a batch of keys to the set.
+
+        Args:
+            keys (np.ndarray): Keys to add; may contain repeats.
+        Returns:
+            np.ndarray: Boolean mask, True where the key is seen for the first time (first occurrence
+            within the batch and not present in the set before).
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        first_seen = np.zeros(len(keys), dtype=bool)
+        unique_keys, first_index = np.unique(keys, return_index=True)
+
+        # The sentinel value cannot be stored in the table, so it is tracked separately
+        is_empty_key = unique_keys == _EMPTY_SLOT
+        if is_empty_key.any():
+            if not self._contains_empty_key:
+                first_seen[first_index[is_empty_key]] = True
+                self._contains_empty_key = True
+                self.size += 1
+            unique_keys, first_index = unique_keys[~is_empty_key], first_index[~is_empty_key]
+
+        self._grow(self.size + len(unique_keys))
+        inserted = self._insert_unique(unique_keys)
+        first_seen[first_index[inserted]] = True
+        self.size += int(inserted.sum())
+        return first_seen
+
+
+class StreamDeduplicator:
+    """
+    Drops rows whose key was already seen earlier in a stream of DataFrame batches, keeping the first occurrence.
+
+    The key is either the `id` column or a 64-bit hash of the whole row's content; only the keys are kept
+    in memory, never the rows. Content is hashed in a canonical form (see `canonical_content`), so the same
+    row gets the same key whatever dtypes pandas inferred for the batch it arrived in.
+    """
+
+    def __init__(self, key: str = "id", column_types: Optional[dict] = None) -> None:
+        """
+        Args:
+            key (str): "content" to hash the full row, otherwise the name of the id column.
+            column_types (Optional[dict]): Column name to schema type ("int", "float" or "category"),
+                e.g. from `config/schema.yaml`; used to canonicalise content before hashing.
+        """
+        self.key = key
+        self.column_types = column_types or {}
+        self.seen = Int64HashSet()
+        self.row_count = 0
+        self.duplicate_count = 0
+
+    def canonical_content(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Casts a batch to a dtype-independent form: schema "int" and "float" columns to float64 (values that
+        are not numbers, such as "na", become NaN), all other columns to strings, in column name order.
+
+        Args:
+            dataframe (DataFrame): A batch of the stream.
+        Returns:
+            DataFrame: The canonical copy to hash.
+        """
+        canonical = {}
+        for column in sorted(dataframe.columns, key=str):
+            values = dataframe[column]
+            if self.column_types.get(column) in ("int", "float"):
+                canonical[column] = pd.to_numeric(values, errors="coerce").astype(np.float64)
+            else:
+                canonical[column] = values.astype(object).where(values.notna(), None).astype(str)
+        return DataFrame(canonical, index=dataframe.index)
+
+    def _keys(self, dataframe: DataFrame) -> tuple:
+        if self.key == "content":
+            hashes = pd.util.hash_pandas_object(self.canonical_content(dataframe), index=False).to_numpy()
+            return hashes.view(np.int64), np.ones(len(dataframe), dtype=bool)
+        ids = pd.to_numeric(dataframe[self.key], errors="coerce")
+        has_key = ids.notna().to_numpy()
+        return ids.fillna(0).to_numpy(dtype=np.int64), has_key
+
+    def deduplicate(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Filters one batch against all batches seen so far.
+
+        Args:
+            dataframe (DataFrame): The next batch of the stream.
+        Returns:
+            DataFrame: The batch without rows whose key was already seen. Rows without a key are kept.
+        """
+        try:
+            keys, has_key = self._keys(dataframe)
+            keep = ~has_key
+            keep[has_key] = self.seen.add_batch(keys[has_key])
+            self.row_count += len(dataframe)
+            self.duplicate_count += int((~keep).sum())
+            return dataframe[keep]
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from src.constants import APP_PORT, SCHEMA_FILE_PATH, TARGET_COLUMN
+from src.utils.main_utils import load_object, read_yaml_file, write_yaml_file
+
+CATEGORY_LEVELS = {
+    "Gender": ["Male", "Female"],
+    "Vehicle_Age": ["< 1 Year", "1-2 Year", "> 2 Years"],
+    "Vehicle_Damage": ["Yes", "No"],
+}
+NUMERIC_RANGES = {
+    "Age": (20, 85),
+    "Driving_License": (0, 2),
+    "Region_Code": (0, 53),
+    "Previously_Insured": (0, 2),
+    "Annual_Premium": (2630, 100000),
+    "Policy_Sales_Channel": (1, 164),
+    "Vintage": (10, 300),
+}
+
+
+def make_synthetic_records(n_records: int, seed: int = 42) -> list:
+    """
+    Generates vehicle insurance records with the columns of `config/schema.yaml` (without the target).
+    """
+    rng = np.random.default_rng(seed)
+    columns = [next(iter(column)) for column in read_yaml_file(SCHEMA_FILE_PATH)["columns"]]
+    data = {}
+    for column in columns:
+        if column == TARGET_COLUMN:
+            continue
+        if column == "id":
+            data[column] = np.arange(1, n_records + 1)
+        elif column in CATEGORY_LEVELS:
+            data[column] = rng.choice(CATEGORY_LEVELS[column], n_records)
+        else:
+            low, high = NUMERIC_RANGES.get(column, (0, 100))
+            data[column] = rng.integers(low, high, n_records)
+    return pd.DataFrame(data).to_dict("records")
+
+
+class StubModel:
+    """
+    Stand-in for the serving model so the app can be load-tested without a trained model.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+
+    def predict(self, dataframe: pd.DataFrame) -> np.ndarray:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return (dataframe["Vehicle_Damage"] == "Yes").to_numpy(dtype=np.int64)
+
+
+class LoadGenerator:
+    """
+    Replays synthetic records against `POST /predict`, either at a fixed arrival rate (open loop: requests are
+    started on schedule whether or not earlier ones finished, and latency is measured from the scheduled
+    start so a stalled server is not hidden) or at a fixed concurrency (closed loop).
+    """
+
+    def __init__(self, client: httpx.AsyncClient, records: list, batch_size: int, batch_ratio: float,
+                 seed: int = 42) -> None:
+        self.client = client
+        self.records = records
+        self.batch_size = batch_size
+        self.batch_ratio = batch_ratio
+        self.rng = np.random.default_rng(seed)
+        self.latencies = []
+        self.errors = 0
+        self.rows = 0
+
+    def _next_payload(self):
+        start = int(self.rng.integers(len(self.records)))
+        if self.batch_size > 1 and self.rng.random() < self.batch_ratio:
+            batch = [self.records[(start + i) % len(self.records)] for i in range(self.batch_size)]
+            return batch, len(batch)
+        return self.records[start], 1
+
+    async def _send(self, scheduled_start: float) -> None:
+        payload, n_rows = self._next_payload()
+        try:
+            response = await self.client.post("/predict", json=payload)
+            if response.status_code != 200:
+                self.errors += 1
+        except httpx.HTTPError:
+            self.errors += 1
+        self.latencies.append(time.perf_counter() - scheduled_start)
+        self.rows += n_rows
+
+    async def run_fixed_rate(self, rate: float, duration: float) -> float:
+        tasks = []
+        start_time = time.perf_counter()
+        for i in range(int(rate * duration)):
+            scheduled_start = start_time + i / rate
+            delay = scheduled_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._send(scheduled_start)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start_time
+
+    async def run_fixed_concurrency(self, concurrency: int, duration: float) -> float:
+        start_time = time.perf_counter()
+        end_time = start_time + duration
+
+        async def worker():
+            while time.perf_counter() < end_time:
+                await self._send(time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start_time
+
+    def report(self, elapsed_seconds: float) -> dict:
+        latencies_ms = np.asarray(self.latencies) * 1000
+        n_requests = len(self.latencies)
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if n_requests else (np.nan,) * 3
+        return {
+            "requests": n_requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "error_rate": self.errors / n_requests if n_requests else 0.0,
+            "throughput_rps": n_requests / elapsed_seconds if elapsed_seconds else 0.0,
+            "throughput_rows_per_s": self.rows / elapsed_seconds if elapsed_seconds else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+        }
+
+
+def check_slo(report: dict, slo: dict) -> list:
+    """
+    Returns the SLO violations of a load test report; `slo` maps report keys to their maximum allowed value.
+    """
+    return [
+        f"{metric} = {report[metric]:.3f} exceeds {limit}"
+        for metric, limit in slo.items()
+        if limit is not None and not report[metric] <= limit
+    ]
+
+
+def build_client(args: argparse.Namespace) -> httpx.AsyncClient:
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+    import app as prediction_app
+    prediction_app.model_predictor.model = (load_object(args.model_file) if args.model_file
+                                            else StubModel(latency_ms=args.stub_latency_ms))
+    transport = httpx.ASGITransport(app=prediction_app.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=args.timeout)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    records = make_synthetic_records(args.records, seed=args.seed)
+    async with build_client(args) as client:
+        generator = LoadGenerator(client, records, batch_size=args.batch_size, batch_ratio=args.batch_ratio,
+                                  seed=args.seed)
+        if args.concurrency:
+            elapsed_seconds = await generator.run_fixed_concurrency(args.concurrency, args.duration)
+        else:
+            elapsed_seconds = await generator.run_fixed_rate(args.rate, args.duration)
+    return generator.report(elapsed_seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the prediction API and check latency SLOs.")
+    parser.add_argument("--url", default=f"http://localhost:{APP_PORT}", help="base URL of a running app")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run the app in-process with a stub model (or --model-file) instead of over HTTP")
+    parser.add_argument("--model-file", help="model to serve in-process instead of the stub")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="simulated stub model latency")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, default=50.0, help="fixed arrival rate in requests per second")
+    mode.add_argument("--concurrency", type=int, help="fixed number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="test duration in seconds")
+    parser.add_argument("--batch-size", type=int, default=100, help="records per batch request")
+    parser.add_argument("--batch-ratio", type=float, default=0.1, help="fraction of requests sent as batches")
+    parser.add_argument("--records", type=int, default=1000, help="number of synthetic records to replay")
+    parser.add_argument("--timeout", type=float, default=30.0, help="request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--slo-p50-ms", type=float)
+    parser.add_argument("--slo-p95-ms", type=float)
+    parser.add_argument("--slo-p99-ms", type=float)
+    parser.add_argument("--max-error-rate", type=float, default=0.0)
+    parser.add_argument("--report-file", help="write the report to this YAML file")
+    args = parser.parse_args()
+
+    load_test_report = asyncio.run(main(args))
+    for key, value in load_test_report.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    if args.report_file:
+        write_yaml_file(args.report_file, load_test_report, replace=True)
+
+    violations = check_slo(load_test_report, {
+        "p50_ms": args.slo_p50_ms,
+        "p95_ms": args.slo_p95_ms,
+        "p99_ms": args.slo_p99_ms,
+        "error_rate": args.max_error_rate,
+    })
+    for violation in violations:
+        print(f"SLO violated: {violation}")
+    sys.exit(1 if violations else 0)
@@ -1,13 +1,38 @@
 import os
 import sys
 
+from contextlib import contextmanager
+from typing import IO, Iterator
+
 import numpy as np
+import pandas as pd
 import dill
 import yaml
 from pandas import DataFrame
 from src.exception import MyException
 from src.logger import logging
 
+@contextmanager
+def atomic_write(file_path: str, mode: str = "w") -> Iterator[IO]:
+    """
+    Opens a temporary file next to `file_path` and moves it over `file_path` once fully written.
+    Replacing the file instead of truncating it in place means a hard link to the old content (e.g. an
+    artifact store blob) is detached rather than overwritten, and readers never see a partial file.
+    Args:
+        file_path (str): The file to write.
+        mode (str): "w" or "wb".
+    """
+    tmp_path = f"{file_path}.tmp"
+    try:
+        with open(tmp_path, mode) as file_obj:
+            yield file_obj
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def read_yaml_file(file_path: str) -> dict:
     """
     Reads a YAML file and returns its contents as a dictionary.
@@ -41,7 +66,7 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
-        with open(file_path, 'w') as file:
+        with atomic_write(file_path, 'w') as file:
             yaml.dump(content, file)
         
         logging.info(f"YAML file {file_path} written successfully.")
@@ -71,31 +96,69 @@ def save_numpy_array_data(file_path: str, array: np.array):
     try:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
-        with open(file_path, 'wb') as file_obj:
+        with atomic_write(file_path, 'wb') as file_obj:
             np.save(file_obj, array)
     except Exception as e:
         raise MyException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: str = None) -> np.array:
     """
     load numpy array data from file
     file_path: str location of file to load
+    mmap_mode: str if set (e.g. "r"), memory-map the file instead of reading it into memory
     return: np.array data loaded
     """
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, 'rb') as file_obj:
             return np.load(file_obj)
     except Exception as e:
         raise MyException(e, sys) from e
 
 
+def read_split_data(feature_store_file_path: str, index_file_path: str) -> DataFrame:
+    """
+    Reads the rows of a train/test split from the feature store through its index manifest.
+    feature_store_file_path: str location of the feature store CSV
+    index_file_path: str location of the split's row-index array
+    return: DataFrame holding only the split's rows
+    """
+    try:
+        indices = np.load(index_file_path)
+        dataframe = pd.read_csv(feature_store_file_path)
+        return dataframe.iloc[indices].reset_index(drop=True)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def iter_split_chunks(feature_store_file_path: str, index_file_path: str, chunk_size: int) -> Iterator[DataFrame]:
+    """
+    Streams the rows of a train/test split from the feature store in chunks, without loading either fully.
+    feature_store_file_path: str location of the feature store CSV
+    index_file_path: str location of the split's sorted row-index array
+    chunk_size: int number of feature store rows read per chunk
+    return: iterator of DataFrames holding the split's rows of each chunk
+    """
+    try:
+        indices = np.load(index_file_path, mmap_mode="r")
+        offset = 0
+        for chunk in pd.read_csv(feature_store_file_path, chunksize=chunk_size):
+            start, end = np.searchsorted(indices, [offset, offset + len(chunk)])
+            if end > start:
+                yield chunk.iloc[np.asarray(indices[start:end]) - offset]
+            offset += len(chunk)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
 def save_object(file_path: str, obj: object) -> None:
     logging.info("Entered the save_object method of utils")
 
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
+        with atomic_write(file_path, "wb") as file_obj:
             dill.dump(obj, file_obj)
 
         logging.info("Exited the save_object method of utils")
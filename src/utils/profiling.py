@@ -0,0 +1,150 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+from src.constants import (PROFILING_DIR_NAME, PROFILING_ENV_KEY, PROFILING_REQUEST_DIR,
+                           PROFILING_REQUEST_FRACTION_ENV_KEY, PROFILING_SAMPLE_INTERVAL, PROFILING_TOP_N)
+from src.entity.config_entity import training_pipeline_config
+from src.logger import logging
+from src.utils.main_utils import atomic_write
+
+
+def profiling_enabled() -> bool:
+    """
+    Returns True if profiling was switched on through the PROFILING environment variable.
+    """
+    return os.getenv(PROFILING_ENV_KEY, "").lower() in ("1", "true", "yes")
+
+
+class StackSampler:
+    """
+    Samples the call stack of one thread at a fixed interval from a background thread and counts identical
+    stacks, in the collapsed format (`outer;inner;leaf count`) read by flamegraph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILING_SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, file_path: str) -> None:
+        with atomic_write(file_path, "w") as file_obj:
+            for stack, count in self.stacks.most_common():
+                file_obj.write(f"{stack} {count}\n")
+
+
+class Profile:
+    """
+    Context manager that profiles the calling thread with cProfile and a stack sampler, then writes
+    `<name>.prof` (for pstats/snakeviz), `<name>.collapsed` (for flamegraphs) and `<name>.top.txt`
+    (the top-N functions by cumulative and by own time) to `output_dir`.
+    """
+
+    def __init__(self, output_dir: str, name: str, top_n: int = PROFILING_TOP_N) -> None:
+        self.output_dir = output_dir
+        self.name = name
+        self.top_n = top_n
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident())
+
+    def __enter__(self) -> "Profile":
+        self.start_time = time.perf_counter()
+        self.sampler.start()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.profiler.disable()
+        self.sampler.stop()
+        elapsed_seconds = time.perf_counter() - self.start_time
+        try:
+            self.write()
+            logging.info(f"Profile of {self.name} ({elapsed_seconds:.3f}s) written to {self.output_dir}")
+        except Exception as e:
+            # A failed profile write must not fail the profiled stage or request
+            logging.error(f"Could not write profile of {self.name}: {e}")
+
+    def write(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        file_path = os.path.join(self.output_dir, self.name)
+        self.profiler.dump_stats(f"{file_path}.prof.tmp")
+        os.replace(f"{file_path}.prof.tmp", f"{file_path}.prof")
+        self.sampler.write(f"{file_path}.collapsed")
+
+        summary = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=summary)
+        for sort_key in ("cumulative", "tottime"):
+            summary.write(f"Top {self.top_n} functions by {sort_key} time\n")
+            stats.sort_stats(sort_key).print_stats(self.top_n)
+        with atomic_write(f"{file_path}.top.txt", "w") as file_obj:
+            file_obj.write(summary.getvalue())
+
+
+def profile_stage(func: Callable) -> Callable:
+    """
+    Profiles each call of a pipeline stage into `<artifact_dir>/profiles/` of the current run.
+
+    The environment is checked once, when the stage is decorated; with profiling disabled the function
+    itself is returned, so there is no overhead at all.
+    """
+    if not profiling_enabled():
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with Profile(os.path.join(training_pipeline_config.artifact_dir, PROFILING_DIR_NAME), func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def profile_sampled_requests(func: Callable) -> Callable:
+    """
+    Profiles a fraction (PROFILING_REQUEST_FRACTION, default 0) of calls to a request handler into
+    `artifact/profiles/requests/`. One request is profiled at a time; concurrent sampled requests run
+    unprofiled. Like `profile_stage`, the function itself is returned when profiling is disabled.
+    """
+    sample_fraction = float(os.getenv(PROFILING_REQUEST_FRACTION_ENV_KEY, "0"))
+    if not profiling_enabled() or sample_fraction <= 0:
+        return func
+    profiling_lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if random.random() >= sample_fraction or not profiling_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            with Profile(PROFILING_REQUEST_DIR, f"{func.__qualname__}_{time.time_ns()}"):
+                return func(*args, **kwargs)
+        finally:
+            profiling_lock.release()
+
+    return wrapper